@@ -0,0 +1,70 @@
+# benchmarks/bench_fingerprint_matcher.py
+"""Pages per second of FingerprintMatcher against one regex search per pattern.
+
+Run from the repository root: python benchmarks/bench_fingerprint_matcher.py
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanners.fingerprint_db import FingerprintDatabase, DEFAULT_FINGERPRINT_FILE
+from scanners.fingerprint_matcher import FingerprintMatcher
+
+WORDS = ["div", "span", "class", "wp-content", "nginx", "lorem", "ipsum", "data-x", "script",
+         "ng-version", "foo", "bar", "fa-star", "jquery-3.1.min.js"]
+
+
+def load_fingerprints():
+    with open(DEFAULT_FINGERPRINT_FILE, "r") as f:
+        technologies = json.load(f).get("technologies")
+    return FingerprintDatabase()._parse_native(technologies)
+
+
+def make_pages(count=20, tokens=20000, seed=1):
+    random.seed(seed)
+    pages = []
+    for _ in range(count):
+        parts = [
+            random.choice(WORDS) if random.random() < 0.05
+            else "".join(random.choice('abcdefghij <>/="') for _ in range(8))
+            for _ in range(tokens)
+        ]
+        pages.append(" ".join(parts))
+    return pages
+
+
+def pages_per_second(match, pages, seconds=3):
+    started, done = time.perf_counter(), 0
+    while time.perf_counter() - started < seconds:
+        for page in pages:
+            match(page)
+            done += 1
+    return done / (time.perf_counter() - started)
+
+
+def main():
+    fingerprints = load_fingerprints()
+    compiled = [(technology, [re.compile(source, flags) for source, flags in patterns])
+                for technology, patterns in fingerprints.items()]
+
+    def per_pattern(text):
+        return [technology for technology, patterns in compiled if any(p.search(text) for p in patterns)]
+
+    matcher = FingerprintMatcher(fingerprints)
+    pages = make_pages()
+    for page in pages:
+        assert matcher.match(page) == per_pattern(page)
+
+    patterns = sum(len(patterns) for patterns in fingerprints.values())
+    print(f"{len(fingerprints)} technologies, {patterns} patterns, {len(pages[0]) // 1024} KB pages")
+    for name, match in (("per-pattern search", per_pattern), ("FingerprintMatcher", matcher.match)):
+        print(f"{name:>20}: {pages_per_second(match, pages):8.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# benchmarks/bench_url_categorizer.py
+"""Seconds to categorize 1M URLs with UrlCategorizer, against the old per-keyword substring loop.
+
+Run from the repository root: python benchmarks/bench_url_categorizer.py [url_count]
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reporting.url_categorizer import UrlCategorizer, CATEGORY_PATTERNS
+
+
+def make_urls(count, seed=3):
+    random.seed(seed)
+    segments = [keyword.replace("\\", "").replace("$", "") for keywords in CATEGORY_PATTERNS.values()
+                for keyword in keywords]
+    segments += ["foo", "bar", "x1", "2024", "01", ".PHP", ".json", "/v2/", "index", "Admin3"]
+    return [
+        f"https://host{random.randint(1, 50)}.example.com/"
+        + "/".join(random.choice(segments).strip("/") for _ in range(random.randint(1, 3)))
+        for _ in range(count)
+    ]
+
+
+def substring_loop(url):
+    """What _categorize_urls used to do per URL (regex entries never matched)."""
+    for category, keywords in CATEGORY_PATTERNS.items():
+        if any(keyword in url.lower() for keyword in keywords):
+            return category
+    return "Misc"
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    urls = make_urls(count)
+    categorizer = UrlCategorizer()
+    for name, categorize in (("substring loop", substring_loop), ("UrlCategorizer", categorizer.categorize)):
+        started = time.perf_counter()
+        for url in urls:
+            categorize(url)
+        elapsed = time.perf_counter() - started
+        print(f"{name:>15}: {elapsed:6.2f}s for {count} URLs ({count / elapsed:,.0f} URLs/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,55 @@ import os
 import multiprocessing
 import mysql.connector
 import asyncio
+import gc
+import threading
+import socket
+import uuid
 from utils.color_print import ColorPrint
 from utils.subdomain_utils import SubdomainUtils
+from utils.db_pool import DatabasePool, FuzzStatusWriter
+from utils.http_pool import HttpSessionPool
+from utils.result_store import ResultStore
 from scanners.technology_detector import TechnologyDetector
 from scanners.fuzzer import Fuzzer
-from reporting.report_generator import ReportGenerator
+from scanners.rate_controller import RateController
+from scanners.scheduler import FuzzScheduler
+from scanners.frontier import RecursionFrontier
+from reporting.report_generator import ReportGenerator, ReportCollector
 
 class WebScanner:
-    def __init__(self, db_config, output_dir):
+    def __init__(self, db_config, output_dir, workers=None, prefetch=None, lease_seconds=600, fuzz_timeout=7200,
+                 http_pool=None, max_request_rate=None, max_fuzzers=None, max_inflight_requests=None,
+                 engine="ffuf", recursion_depth=0, recursion_budget=None, fast_pass=None, max_resumes=2):
         self.db_config = db_config
         self.output_dir = output_dir
-        self.tech_detector = TechnologyDetector()
-        self.fuzzer = Fuzzer(output_dir)
-        self.report_generator = ReportGenerator(output_dir)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"  # Identifies this node's claims
+        self.lease_seconds = lease_seconds  # Claims not renewed within this window are reclaimable
+        self.fuzz_timeout = fuzz_timeout  # Per-host ffuf budget in seconds
+        self.max_resumes = max_resumes  # Further claims of a host whose run ended partial or errored
+        self.db_pool = DatabasePool(db_config)
+        self.status_writer = FuzzStatusWriter(self.db_pool)
+        self.workers = workers or os.cpu_count() or 1  # Concurrent technology detections
+        self.prefetch = prefetch if prefetch is not None else self.workers  # Detected hosts kept queued for prioritization
+        # Upper bound on concurrent ffuf processes; the scheduler moves below it with the load average
+        self.max_fuzzers = max_fuzzers or 2 * (os.cpu_count() or 1)
+        self.max_inflight_requests = max_inflight_requests  # Sum of ffuf threads; defaults to the socket budget
+        # One keep-alive session pool (proxies, retries) shared by every HTTP prober
+        self.http_pool = http_pool or HttpSessionPool()
+        self.tech_detector = TechnologyDetector(http_pool=self.http_pool)
+        # Every hit is kept in an indexed local store for cross-host queries and report rebuilds
+        self.result_store = ResultStore(os.path.join(output_dir, "findings.db"))
+        # ffuf threads/rate follow each host's measured latency; max_request_rate caps all workers together
+        self.rate_controller = RateController(global_rate=max_request_rate)
+        # engine="native" fuzzes in-process over keep-alive connections instead of spawning ffuf
+        self.fuzzer = Fuzzer(output_dir, result_store=self.result_store, rate_controller=self.rate_controller,
+                             engine=engine)
+        self.report_generator = ReportGenerator(output_dir, http_pool=self.http_pool, result_store=self.result_store)
+        # Directories found are fuzzed in turn, up to recursion_depth levels and recursion_budget requests per host
+        self.frontier = RecursionFrontier(max_depth=recursion_depth, request_budget=recursion_budget)
+        # With fast_pass=N, every claimable host first gets only the N historically best paths of its
+        # wordlist; the full lists run afterwards and resume where the fast pass stopped
+        self.fast_pass = fast_pass
 
     def print_banner(self):
         banner = """
@@ -29,7 +65,7 @@ class WebScanner:
 
     def connect_db(self):
         try:
-            return mysql.connector.connect(**self.db_config)
+            return self.db_pool.get_connection()
         except mysql.connector.Error as err:
             ColorPrint.error(f"Error connecting to database: {err}")
             raise
@@ -38,50 +74,177 @@ class WebScanner:
         if connection and connection.is_connected():
             connection.close()
 
-    def get_subdomains_from_db(self, limit=10):
+    def ensure_claim_columns(self):
+        """Add the claim/lease columns to the live table if they are missing."""
         conn = self.connect_db()
         cursor = conn.cursor()
         try:
-            query = "SELECT alive FROM live WHERE fuzz < 2 ORDER BY id DESC LIMIT %s"  # Only get subdomains with fuzz < 2
-            cursor.execute(query, (limit,))
-            subdomains = [row[0] for row in cursor.fetchall()]
-            return subdomains
+            cursor.execute(
+                "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'live'"
+            )
+            columns = {row[0] for row in cursor.fetchall()}
+            if 'claimed_by' not in columns:
+                cursor.execute(
+                    "ALTER TABLE live ADD COLUMN claimed_by VARCHAR(128) NULL, "
+                    "ADD COLUMN lease_expires DATETIME NULL, "
+                    "ADD INDEX idx_live_claim (fuzz, lease_expires)"
+                )
+                conn.commit()
+                ColorPrint.info("Added claim/lease columns to the live table.")
+            if 'fast_pass' not in columns:
+                cursor.execute("ALTER TABLE live ADD COLUMN fast_pass TINYINT NOT NULL DEFAULT 0")
+                conn.commit()
+                ColorPrint.info("Added the fast_pass column to the live table.")
+            if 'fuzz_resumes' not in columns:
+                cursor.execute("ALTER TABLE live ADD COLUMN fuzz_resumes TINYINT NOT NULL DEFAULT 0")
+                conn.commit()
+                ColorPrint.info("Added the fuzz_resumes column to the live table.")
+        finally:
+            cursor.close()
+            self.close_db(conn)
+
+    def claim_subdomains(self, limit=10, fast_pass=False):
+        """Atomically claim up to `limit` unfuzzed subdomains for this worker.
+
+        Rows are locked, marked with our worker id and a lease expiry in one
+        transaction, so other scanner nodes skip them. Rows whose lease has
+        expired (a crashed node) are claimable again, and so are rows whose
+        run ended partial (5) or errored (3), up to `max_resumes` times; the
+        node holding the host's checkpoint resumes it, any other starts over.
+        With `fast_pass`, only rows that have not had their fast pass are claimed.
+        """
+        conn = self.connect_db()
+        cursor = conn.cursor()
+        try:
+            conn.start_transaction()
+            query = (
+                "SELECT id, alive FROM live "
+                "WHERE (fuzz < 2 OR (fuzz IN (3, 5) AND fuzz_resumes <= %s)) "
+                "AND (claimed_by IS NULL OR lease_expires < NOW()) "
+                + ("AND fast_pass = 0 " if fast_pass else "") +
+                "ORDER BY id DESC LIMIT %s FOR UPDATE SKIP LOCKED"
+            )
+            cursor.execute(query, (self.max_resumes, limit))
+            rows = cursor.fetchall()
+            if rows:
+                placeholders = ", ".join(["%s"] * len(rows))
+                cursor.execute(
+                    f"UPDATE live SET claimed_by = %s, lease_expires = NOW() + INTERVAL %s SECOND WHERE id IN ({placeholders})",
+                    (self.worker_id, self.lease_seconds, *[row[0] for row in rows])
+                )
+            conn.commit()
+            return [row[1] for row in rows]
         except mysql.connector.Error as err:
-            ColorPrint.error(f"Error fetching subdomains from database: {err}")
+            conn.rollback()
+            ColorPrint.error(f"Error claiming subdomains from database: {err}")
             return []
         finally:
             cursor.close()
             self.close_db(conn)
 
-    def update_fuzz_status(self, subdomain, status, directories_found=0):
+    def renew_leases(self, subdomains):
+        """Extend the lease on subdomains this worker is still processing."""
+        if not subdomains:
+            return
         conn = self.connect_db()
         cursor = conn.cursor()
         try:
-            query = "UPDATE live SET fuzz = %s, directories_found = %s WHERE alive = %s"
-            cursor.execute(query, (status, directories_found, subdomain,))
+            placeholders = ", ".join(["%s"] * len(subdomains))
+            cursor.execute(
+                f"UPDATE live SET lease_expires = NOW() + INTERVAL %s SECOND WHERE claimed_by = %s AND alive IN ({placeholders})",
+                (self.lease_seconds, self.worker_id, *subdomains)
+            )
             conn.commit()
-            status_message = {
-                1: f"Updated fuzz status for {subdomain} in the database with {directories_found} directories found.",
-                5: f"Fuzzing for {subdomain} timed out (2 hours). Fuzz status updated to 5."
-            }.get(status, f"Updated fuzz status for {subdomain} to {status}.")
-            ColorPrint.info(status_message)
         except mysql.connector.Error as err:
-            ColorPrint.error(f"Error updating fuzz status for {subdomain}: {err}")
+            ColorPrint.error(f"Error renewing leases: {err}")
         finally:
             cursor.close()
             self.close_db(conn)
 
-    async def _run_fuzzer_with_timeout(self, subdomain, technology):
+    def release_claims(self, subdomains):
+        """Give back claims on subdomains that were never finished (e.g. on shutdown)."""
+        if not subdomains:
+            return
+        conn = self.connect_db()
+        cursor = conn.cursor()
         try:
-            async with asyncio.timeout(7200):  # 2 hours in seconds
-                return self.fuzzer.fuzz_subdomain(subdomain, technology)
-        except asyncio.TimeoutError:
-            return None
+            placeholders = ", ".join(["%s"] * len(subdomains))
+            cursor.execute(
+                f"UPDATE live SET claimed_by = NULL, lease_expires = NULL WHERE claimed_by = %s AND (fuzz < 2 OR fuzz IN (3, 5)) AND alive IN ({placeholders})",
+                (self.worker_id, *subdomains)
+            )
+            conn.commit()
+        except mysql.connector.Error as err:
+            ColorPrint.error(f"Error releasing claims: {err}")
+        finally:
+            cursor.close()
+            self.close_db(conn)
+
+    def mark_fast_passed(self, subdomains):
+        """Record that subdomains had their fast pass and give their claims back for the full run."""
+        if not subdomains:
+            return
+        conn = self.connect_db()
+        cursor = conn.cursor()
+        try:
+            placeholders = ", ".join(["%s"] * len(subdomains))
+            cursor.execute(
+                f"UPDATE live SET fast_pass = 1, claimed_by = NULL, lease_expires = NULL WHERE claimed_by = %s AND alive IN ({placeholders})",
+                (self.worker_id, *subdomains)
+            )
+            conn.commit()
+        except mysql.connector.Error as err:
+            ColorPrint.error(f"Error recording fast passes: {err}")
+        finally:
+            cursor.close()
+            self.close_db(conn)
+
+    def update_fuzz_status(self, subdomain, status, directories_found=0):
+        """Queue a status update; the writer flushes them to MySQL in batches."""
+        self.status_writer.add(subdomain, status, directories_found)
+        status_message = {
+            1: f"Updated fuzz status for {subdomain} in the database with {directories_found} directories found.",
+            5: f"Fuzzing for {subdomain} stopped early with {directories_found} partial results. Fuzz status updated to 5."
+        }.get(status, f"Updated fuzz status for {subdomain} to {status}.")
+        ColorPrint.info(status_message)
+
+    async def _run_fuzzer_with_timeout(self, subdomain, technology, report, profile=None, directories=None,
+                                       word_limit=None):
+        # ffuf runs as an async subprocess, so the deadline actually kills it; its load is
+        # sized from the latency and errors seen while detecting the technology
+        if profile is None:
+            profile = self.http_pool.host_profile(subdomain)
+        stream = self.fuzzer.stream_subdomain(subdomain, technology, timeout=self.fuzz_timeout, profile=profile,
+                                              word_limit=word_limit)
+        async for item in stream:
+            ColorPrint.info(f"[{item.get('status')}] {item.get('url')}")
+            report.add(item)
+            if directories is not None:
+                path = RecursionFrontier.directory(item)
+                if path:
+                    rank = RecursionFrontier.rank(item['status'])
+                    directories[path] = min(rank, directories.get(path, rank))
+        return stream
 
     def process_subdomain(self, subdomain):
-        """Processes a single subdomain (this will be run in parallel)."""
+        """Detect and fuzz a single subdomain in one go.
+
+        Returns a (status, directories_found) tuple; the parent process records
+        it so database writes stay out of the pool workers.
+        """
+        detected = self.detect_subdomain(subdomain)
+        if detected[0] != "fuzz":
+            return detected[1]
+        return self.fuzz_subdomain(subdomain, *detected[1:])[:2]
+
+    def detect_subdomain(self, subdomain):
+        """First stage (run in parallel): detect the technology and decide whether to fuzz.
+
+        Returns ("fuzz", technology, tech_details, profile) for hosts to fuzz,
+        or ("done", (status, directories_found)) for hosts that are finished.
+        """
         ColorPrint.header(f"Processing {subdomain}")
-        results = {}  # Initialize results for each subdomain
 
         try:
             # Detect technology
@@ -91,71 +254,244 @@ class WebScanner:
             # Filter unwanted results
             if not SubdomainUtils.filter_unwanted_results(subdomain, tech_details):
                 ColorPrint.warning(f"Skipping {subdomain} due to unwanted criteria.")
-                self.update_fuzz_status(subdomain, 2) # Mark as skipped
-                return  # Exit the function for this subdomain
+                return "done", (2, 0)  # Mark as skipped
+
+            return "fuzz", technology, tech_details, self.http_pool.host_profile(subdomain)
 
-            # Run fuzzing with timeout
-            ColorPrint.header("Starting Directory Fuzzing")
-            fuzz_results = asyncio.run(self._run_fuzzer_with_timeout(subdomain, technology))
+        except KeyboardInterrupt:
+            raise
+        except Exception as e:
+            ColorPrint.error(f"Error processing {subdomain}: {str(e)}")
+            return "done", (3, 0)  # Mark as error
 
-            if fuzz_results is None:
-                ColorPrint.warning(f"Fuzzing for {subdomain} timed out.")
-                self.update_fuzz_status(subdomain, 5)
-                return
+    def fuzz_subdomain(self, subdomain, technology, tech_details, profile=None, base_url=None, word_limit=None):
+        """Second stage (run in parallel once scheduled): fuzz the host and write its report.
 
-            # Count all found resources (directories and files)
-            directories_found_count = len(fuzz_results['results'])
+        `base_url` fuzzes a directory of the host (e.g. "https://host/admin")
+        instead of its root; it gets its own report and stored findings.
+        `word_limit` makes it a fast pass over the head of the wordlist,
+        whose report is left off the dashboard until the full run.
+        Returns a (status, directories_found, directories, summary) tuple,
+        where directories maps the directory paths among the hits to their
+        RecursionFrontier rank (empty unless recursion is enabled) and
+        summary is the run's dashboard summary (None if it failed). A
+        directory run stays off the dashboard; its summary is folded into
+        the host's entry once the host's frontier is done.
+        """
+        target = base_url or subdomain
+        directories = {} if self.frontier.enabled and not word_limit else None
+        try:
+            # Run fuzzing with timeout, feeding hits into the report as they arrive
+            ColorPrint.header(f"Starting Directory Fuzzing for {target}")
+            report = self.report_generator.start_report(target, technology, tech_details)
+            fuzz_stream = asyncio.run(
+                self._run_fuzzer_with_timeout(target, technology, report, profile, directories, word_limit)
+            )
+
+            if fuzz_stream.failed:
+                ColorPrint.warning(f"Fuzzing for {target} failed.")
+                return 3, 0, {}, None
 
-            # Store results for the current subdomain
-            results[subdomain] = {
-                "technology": technology,
-                "tech_details": tech_details,
-                "fuzz_results": fuzz_results
-            }
+            # Count all found resources (directories and files)
+            directories_found_count = fuzz_stream.count
 
             # Generate report for the current subdomain
-            self.report_generator.generate_report(subdomain, results)
-            ColorPrint.success(f"Report generated for {subdomain}.")
+            summary = report.finish(dashboard=not word_limit and not base_url)
+            ColorPrint.success(f"Report generated for {target}.")
+
+            if fuzz_stream.timed_out or fuzz_stream.throttled:
+                ColorPrint.warning(f"Fuzzing for {target} {'timed out' if fuzz_stream.timed_out else 'was throttled'}.")
+                return 5, directories_found_count, directories or {}, summary # Partial results are still stored
 
-            self.update_fuzz_status(subdomain, 1, directories_found_count) # Update with the count
+            return 1, directories_found_count, directories or {}, summary # Update with the count
 
         except KeyboardInterrupt:
             raise
         except Exception as e:
-            ColorPrint.error(f"Error processing {subdomain}: {str(e)}")
-            self.update_fuzz_status(subdomain, 3) # Mark as error
-            return
+            ColorPrint.error(f"Error processing {target}: {str(e)}")
+            return 3, 0, {}, None # Mark as error
 
-        # Remove the report generation here as it's already done above
-        # self.report_generator.generate_report(subdomain, results)
-        # ColorPrint.success(f"Report generated for {subdomain}.")
+    def _renew_leases_periodically(self, in_flight, lock, stop):
+        """Keep leases alive for every claimed host until `stop` is set."""
+        while not stop.wait(self.lease_seconds / 3):
+            with lock:
+                claimed = list(in_flight)
+            self.renew_leases(claimed)
 
     def run(self):
+        in_flight = set()
+        fast_passed = []  # Hosts whose fast pass finished, waiting to be recorded in the database
+        stop_renewing = threading.Event()
         try:
             self.print_banner()
+            self.ensure_claim_columns()
+            detection_cache = self.tech_detector.detection_cache
+            # The counters add up across runs, so this run's share is the difference
+            cache_before = detection_cache.stats() if detection_cache else None
+
+            completed = [0]  # Bumped on every finished stage so the producer never misses a wakeup
+            slot_freed = threading.Condition()
+            scheduler = FuzzScheduler(self.max_fuzzers, self.max_inflight_requests)
+            detecting = set()
+            phase = {"word_limit": None}  # The fast pass's word limit while it runs
+            renewer = threading.Thread(
+                target=self._renew_leases_periodically,
+                args=(in_flight, slot_freed, stop_renewing),
+                daemon=True
+            )
+            renewer.start()
+
+            def finish(subdomain, outcome):
+                status, directories_found = outcome
+                if phase["word_limit"] and status in (1, 5):
+                    fast_passed.append(subdomain)  # Not done yet; the full run comes later
+                else:
+                    self.update_fuzz_status(subdomain, status, directories_found)
+                in_flight.discard(subdomain)
+
+            def schedule(subdomain, technology, tech_details, profile, path=None, depth=0):
+                # Directory runs are queued under their own URL, behind root runs of other hosts
+                base_url = subdomain.rstrip("/") + path.rstrip("/") if path else None
+                word_limit = phase["word_limit"]
+                lines = self.fuzzer.wordlist_size(technology)
+                scheduler.push(
+                    base_url or subdomain, (subdomain, technology, tech_details, profile, base_url, depth, word_limit),
+                    threads=self.rate_controller.plan(profile)["threads"],
+                    technology=technology,
+                    wordlist_lines=min(lines, word_limit) if word_limit else lines,
+                    depth=depth
+                )
 
-            while True:
-                # Step 1: Get the next batch of unfuzzed subdomains from the database
-                live_subdomains = self.get_subdomains_from_db(limit=10)
+            def on_detected(subdomain, detected):
+                with slot_freed:
+                    detecting.discard(subdomain)
+                    if detected[0] == "fuzz":
+                        if self.frontier.enabled and not phase["word_limit"]:
+                            self.frontier.start(subdomain)
+                        schedule(subdomain, *detected[1:])
+                    else:
+                        finish(subdomain, detected[1])
+                    completed[0] += 1
+                    slot_freed.notify()
 
-                if not live_subdomains:
-                    ColorPrint.info("No more subdomains to fuzz at the moment.")
-                    break  # Exit the loop if no more subdomains are found
+            def on_fuzzed(key, job, outcome):
+                subdomain, technology, tech_details, profile, _, depth, word_limit = job
+                with slot_freed:
+                    # Only full root runs teach the scheduler what a technology yields
+                    yielded = outcome[1] if outcome[0] in (1, 5) and depth == 0 and not word_limit else None
+                    scheduler.finish(key, technology, yielded)
+                    if self.frontier.enabled and not word_limit:
+                        cost = self.fuzzer.wordlist_size(technology)
+                        self.frontier.record(subdomain, depth, outcome, outcome[2], cost)
+                        child = self.frontier.next(subdomain, cost)
+                        if child:
+                            schedule(subdomain, technology, tech_details, profile, *child)
+                        else:
+                            status, found, summaries = self.frontier.finish(subdomain)
+                            if len(summaries) > 1:
+                                # Directory runs only reach the dashboard through their host's entry
+                                dashboard = self.report_generator.dashboard
+                                dashboard.record_host(dashboard.combine(summaries, ReportCollector.max_dashboard_paths))
+                            finish(subdomain, (status, found))
+                    else:
+                        finish(subdomain, outcome[:2])
+                    completed[0] += 1
+                    slot_freed.notify()
 
-                ColorPrint.success(f"Found {len(live_subdomains)} subdomains to fuzz in this batch.")
+            # Hit history from earlier runs puts each technology's most productive paths first
+            self.fuzzer.rank_wordlists()
 
-                # Step 2: Process each subdomain in parallel
-                with multiprocessing.Pool() as pool:
-                    pool.map(self.process_subdomain, live_subdomains)
+            # The rate budget is shared memory, so it has to exist before the workers fork
+            self.rate_controller.share_budget()
 
-                ColorPrint.info("Finished processing the current batch of subdomains.")
+            # Load the fingerprint index before forking so workers share it copy-on-write;
+            # freezing the GC keeps collections from touching (and copying) those pages
+            self.tech_detector.fingerprint_db.load()
+            gc.freeze()
+
+            # One process per detection slot plus one per possible ffuf run, so scheduled work never
+            # queues inside the pool; the scheduler decides how many ffuf runs are actually active
+            with multiprocessing.Pool(processes=self.workers + self.max_fuzzers) as pool:
+                for limit in ([self.fast_pass, None] if self.fast_pass else [None]):
+                    phase["word_limit"] = limit
+                    if limit:
+                        ColorPrint.header(f"Fast pass: the top {limit} paths of every host first")
+                    while True:
+                        with slot_freed:
+                            scheduler.adjust_for_load()
+                            while True:
+                                job = scheduler.next_job()
+                                if job is None:
+                                    break
+                                key, job = job
+                                subdomain, technology, tech_details, profile, base_url, _, word_limit = job
+                                pool.apply_async(
+                                    self.fuzz_subdomain, (subdomain, technology, tech_details, profile, base_url, word_limit),
+                                    callback=lambda outcome, k=key, j=job: on_fuzzed(k, j, outcome),
+                                    error_callback=lambda e, k=key, j=job: on_fuzzed(k, j, (3, 0, {}, None))
+                                )
+                            # Keep detections running while too few detected hosts are waiting to be fuzzed
+                            free_slots = self.workers - len(detecting)
+                            if scheduler.queued >= self.prefetch:
+                                free_slots = 0
+                            seen_completed = completed[0]
+                            passed, fast_passed[:] = fast_passed[:], []
+
+                        self.mark_fast_passed(passed)
+                        new_subdomains = []
+                        if free_slots > 0:
+                            # Claimed rows are invisible to every node until released or expired
+                            new_subdomains = self.claim_subdomains(limit=free_slots, fast_pass=bool(phase["word_limit"]))
+
+                        for subdomain in new_subdomains:
+                            with slot_freed:
+                                in_flight.add(subdomain)
+                                detecting.add(subdomain)
+                            pool.apply_async(
+                                self.detect_subdomain, (subdomain,),
+                                callback=lambda detected, s=subdomain: on_detected(s, detected),
+                                error_callback=lambda e, s=subdomain: on_detected(s, ("done", (3, 0)))
+                            )
+
+                        if new_subdomains:
+                            ColorPrint.success(
+                                f"Queued {len(new_subdomains)} subdomains for detection "
+                                f"({scheduler.running} fuzzing, {scheduler.queued} waiting, {len(in_flight)} in flight)."
+                            )
+
+                        with slot_freed:
+                            if not in_flight:
+                                if not new_subdomains:
+                                    ColorPrint.info("No more subdomains to fuzz at the moment.")
+                                    break
+                                continue
+                            # Sleep until a stage finishes; wake up now and then to follow the load average
+                            slot_freed.wait_for(lambda: completed[0] != seen_completed, timeout=15)
+
+                    self.mark_fast_passed(fast_passed)
+                    fast_passed.clear()
 
             ColorPrint.success("Fuzzing completed for all available subdomains!")
+            if cache_before is not None:
+                stats = detection_cache.stats()
+                run = {counter: stats[counter] - cache_before[counter] for counter in detection_cache.counters}
+                ColorPrint.info(
+                    f"Technology detection cache this run: {run['hits']} hits, {run['content_hits']} unchanged pages, "
+                    f"{run['misses']} misses ({stats['entries']} hosts cached in total)."
+                )
 
         except KeyboardInterrupt:
             ColorPrint.warning("\nScanning interrupted by user.")
         except Exception as e:
             ColorPrint.error(f"Unexpected error: {str(e)}")
+        finally:
+            stop_renewing.set()
+            try:
+                self.status_writer.close()
+                self.mark_fast_passed(fast_passed)
+            finally:
+                # Hand unfinished hosts back so other nodes can pick them up immediately
+                self.release_claims(list(in_flight))
 
 if __name__ == "__main__":
     # Database configuration
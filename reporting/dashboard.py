@@ -0,0 +1,263 @@
+# reporting/dashboard.py
+import os
+import json
+import fcntl
+import html
+import hashlib
+from contextlib import contextmanager
+from datetime import datetime
+from utils.color_print import ColorPrint
+from utils.atomic_file import atomic_write
+
+class DashboardAggregator:
+    """Fleet-wide index of every host report, updated as each host finishes.
+
+    Hosts are folded into a small running state file that index.html is
+    rendered from, under a file lock; a re-fuzzed host replaces its numbers.
+    """
+    state_file = "dashboard_state.json"
+    hosts_file = "dashboard_hosts.js"
+    index_file = "index.html"
+    lock_file = ".dashboard.lock"
+    summaries_dir = ".dashboard_summaries"
+    # Categories whose hits are worth surfacing across hosts
+    interesting_categories = ("Admin", "API", "Auth", "Config", "Data", "Dev", "Backup", "System")
+
+    def __init__(self, output_dir, top_paths=50, max_tracked_paths=20000):
+        self.output_dir = output_dir
+        self.top_paths = top_paths
+        # Path counters are pruned back to half this size when it is exceeded, keeping
+        # the heaviest paths; counts of rare paths are approximate after pruning
+        self.max_tracked_paths = max_tracked_paths
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, self.lock_file), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def record_host(self, summary):
+        """Fold one host's summary into the dashboard and re-render it.
+
+        `summary` holds host, technology, report (file name), total,
+        status_codes, categories and interesting_paths.
+        """
+        try:
+            with self._locked():
+                state = self._load_state()
+                previous = self._load_summary(summary["host"])
+                self._merge(state, summary, previous)
+                self._store_summary(summary)
+                self._append_host(summary)
+                self._write_atomic(self.state_file, json.dumps(state))
+                self._write_atomic(self.index_file, self._render(state))
+        except Exception as e:
+            ColorPrint.error(f"Error updating dashboard for {summary.get('host')}: {str(e)}")
+
+    def combine(self, summaries, max_paths=None):
+        """One summary for a host from the summaries of its root run and its directory runs.
+
+        The root's summary comes first and names the report; interesting
+        paths are kept in run order, up to `max_paths`.
+        """
+        combined = dict(summaries[0], total=0, status_codes={}, categories={})
+        paths = {}
+        for summary in summaries:
+            combined["total"] += summary["total"]
+            self._add_counts(combined["status_codes"], summary["status_codes"].items(), 1)
+            self._add_counts(combined["categories"], summary["categories"].items(), 1)
+            paths.update(dict.fromkeys(summary["interesting_paths"]))
+        combined["interesting_paths"] = sorted(list(paths)[:max_paths])
+        return combined
+
+    def _load_state(self):
+        try:
+            with open(os.path.join(self.output_dir, self.state_file), "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {"hosts": 0, "total_urls": 0, "status_codes": {}, "categories": {}, "paths": {}}
+
+    def _summary_path(self, host):
+        name = hashlib.sha256(host.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.summaries_dir, f"{name}.json")
+
+    def _load_summary(self, host):
+        try:
+            with open(os.path.join(self.output_dir, self._summary_path(host)), "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _store_summary(self, summary):
+        os.makedirs(os.path.join(self.output_dir, self.summaries_dir), exist_ok=True)
+        self._write_atomic(self._summary_path(summary["host"]), json.dumps({
+            "total": summary["total"],
+            "status_codes": {str(status): count for status, count in summary["status_codes"].items()},
+            "categories": summary["categories"],
+            "interesting_paths": list(summary["interesting_paths"])
+        }))
+
+    def _add_counts(self, counts, items, sign):
+        for key, count in items:
+            value = counts.get(key, 0) + sign * count
+            if value > 0:
+                counts[key] = value
+            else:
+                counts.pop(key, None)
+
+    def _merge(self, state, summary, previous=None):
+        if previous is None:
+            state["hosts"] += 1
+        else:
+            # The host was recorded before; take its old numbers out first
+            state["total_urls"] -= previous["total"]
+            self._add_counts(state["status_codes"], previous["status_codes"].items(), -1)
+            self._add_counts(state["categories"], previous["categories"].items(), -1)
+            self._add_counts(state["paths"], ((path, 1) for path in previous["interesting_paths"]), -1)
+
+        state["total_urls"] += summary["total"]
+        self._add_counts(state["status_codes"], ((str(status), count) for status, count in summary["status_codes"].items()), 1)
+        self._add_counts(state["categories"], summary["categories"].items(), 1)
+
+        paths = state["paths"]
+        self._add_counts(paths, ((path, 1) for path in summary["interesting_paths"]), 1)
+        if len(paths) > self.max_tracked_paths:
+            keep = sorted(paths.items(), key=lambda item: item[1], reverse=True)[:self.max_tracked_paths // 2]
+            state["paths"] = dict(keep)
+
+    def _append_host(self, summary):
+        path = os.path.join(self.output_dir, self.hosts_file)
+        record = {
+            "host": summary["host"],
+            "technology": summary.get("technology") or "",
+            "report": summary["report"],
+            "total": summary["total"],
+            "status_codes": {str(status): count for status, count in summary["status_codes"].items()},
+            "finished": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        new_file = not os.path.exists(path)
+        with open(path, "a", encoding="utf-8") as f:
+            if new_file:
+                f.write("window.REPORT_HOSTS = window.REPORT_HOSTS || [];\n")
+            f.write(f"REPORT_HOSTS.push({json.dumps(record)});\n")
+
+    def _write_atomic(self, name, content):
+        with atomic_write(os.path.join(self.output_dir, name)) as f:
+            f.write(content)
+
+    def _render(self, state):
+        """Render index.html from the aggregate state; host rows load from the host list script."""
+        total_urls = state["total_urls"]
+        page = []
+        page.append("<!DOCTYPE html>")
+        page.append("<html lang='en' class='dark-mode'>")
+        page.append("<head>")
+        page.append("<meta charset='UTF-8'>")
+        page.append("<meta name='viewport' content='width=device-width, initial-scale=1.0'>")
+        page.append("<title>Web Scanner Dashboard</title>")
+        page.append("<link href='https://fonts.googleapis.com/css2?family=Roboto:wght@400;500;700&display=swap' rel='stylesheet'>")
+        page.append("<link href='https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css' rel='stylesheet' />")
+        page.append("<link href='report_assets.css' rel='stylesheet' />")
+        page.append(f"<script src='{self.hosts_file}'></script>")
+        page.append("</head>")
+        page.append("<body>")
+        page.append("<div class='container'>")
+        page.append("<header class='report-header'>")
+        page.append("<h1 class='report-title'><i class='fas fa-spider'></i> Web Scanner Dashboard</h1>")
+        page.append(f"<p class='report-timestamp'>Updated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>")
+        page.append("</header>")
+
+        page.append("<div class='summary'>")
+        page.append("<h2>Fleet Summary</h2>")
+        page.append("<div class='stats-grid'>")
+        page.append(f"<div class='stat-card'><h3 class='stat-title'>Hosts</h3><p class='stat-value'>{state['hosts']}</p></div>")
+        page.append(f"<div class='stat-card'><h3 class='stat-title'>Total URLs</h3><p class='stat-value'>{total_urls}</p></div>")
+        page.append(self._render_bars("Status Codes", state["status_codes"], total_urls, by_key=True))
+        page.append(self._render_bars("Categories", state["categories"], total_urls))
+        page.append("</div>")
+        page.append("</div>")
+
+        page.append("<div class='category-section'>")
+        page.append("<h3>Top Interesting Paths (hosts exposing each)</h3>")
+        top = sorted(state["paths"].items(), key=lambda item: item[1], reverse=True)[:self.top_paths]
+        for path, hosts in top:
+            page.append(
+                f"<div class='url-item'><span class='url'>{html.escape(path)}</span>"
+                f"<span class='size'>{hosts} hosts</span></div>"
+            )
+        page.append("</div>")
+
+        page.append("<div class='category-section'>")
+        page.append("<h3>Hosts</h3>")
+        page.append("<div class='search-box'><i class='fas fa-search'></i> <input type='text' id='hostSearch' placeholder='Search hosts...' /></div>")
+        page.append("<div id='host-list'></div>")
+        page.append("</div>")
+        page.append(self._host_list_script())
+        page.append("</div>")
+        page.append("</body>")
+        page.append("</html>")
+        return "\n".join(page)
+
+    def _render_bars(self, title, counts, total, by_key=False):
+        items = sorted(counts.items(), key=(lambda item: int(item[0]) if item[0].isdigit() else 0) if by_key else (lambda item: -item[1]))
+        rows = [f"<div class='stat-card'><h3 class='stat-title'>{title}</h3>"]
+        for label, count in items:
+            percentage = (count / total) * 100 if total > 0 else 0
+            rows.append(
+                f"<div class='status-bar-with-progress'><span class='status-label'>{html.escape(label)}</span>"
+                f"<div class='progress-bar'><div class='progress-bar-inner info' style='width: {percentage:.1f}%'></div></div>"
+                f"<span class='status-count'>{count}</span></div>"
+            )
+        rows.append("</div>")
+        return "\n".join(rows)
+
+    def _host_list_script(self):
+        """Render the host table client-side from REPORT_HOSTS, newest first, capped for speed.
+
+        A host recorded again appends a new row; only its latest one is shown.
+        """
+        return """
+        <script>
+        document.addEventListener('DOMContentLoaded', function() {
+            const seen = new Set();
+            const hosts = (window.REPORT_HOSTS || []).slice().reverse().filter(host => {
+                if (seen.has(host.host)) return false;
+                seen.add(host.host);
+                return true;
+            });
+            const list = document.getElementById('host-list');
+            const limit = 1000;
+
+            function render(term) {
+                const rows = document.createDocumentFragment();
+                let shown = 0;
+                for (const host of hosts) {
+                    if (term && !host.host.toLowerCase().includes(term)) continue;
+                    if (shown++ >= limit) break;
+                    const row = document.createElement('div');
+                    row.className = 'url-item';
+                    const link = document.createElement('a');
+                    link.href = host.report;
+                    link.target = '_blank';
+                    link.textContent = host.host;
+                    const url = document.createElement('span');
+                    url.className = 'url';
+                    url.appendChild(link);
+                    const info = document.createElement('span');
+                    info.className = 'size';
+                    info.textContent = host.total + ' URLs \\u00b7 ' + (host.technology || 'unknown') + ' \\u00b7 ' + host.finished;
+                    row.append(url, info);
+                    rows.appendChild(row);
+                }
+                list.replaceChildren(rows);
+            }
+
+            document.getElementById('hostSearch').addEventListener('input', e => render(e.target.value.toLowerCase()));
+            render('');
+        });
+        </script>
+        """
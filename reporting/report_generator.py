@@ -1,151 +1,133 @@
 # reporting/report_generator.py
 import os
 import json
+import tempfile
 from datetime import datetime
+from contextlib import ExitStack
+from urllib.parse import urlsplit
 from utils.color_print import ColorPrint
+from utils.http_pool import HttpSessionPool
+from utils.atomic_file import atomic_write
+from reporting.url_categorizer import default_categorizer
+from reporting.dashboard import DashboardAggregator
 import requests
-import re
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared asset files already written (or verified) by this process
+_assets_ready = set()
 
 class ReportGenerator:
-    def __init__(self, output_dir):
+    # Static CSS/JS written once per output directory and referenced by every report
+    css_asset = "report_assets.css"
+    js_asset = "report_assets.js"
+    virtual_js_asset = "report_virtual.js"
+
+    def __init__(self, output_dir, max_connections=20, http_pool=None, chunk_size=500,
+                 report_mode="auto", virtual_threshold=5000, result_store=None):
         self.output_dir = output_dir
+        self.result_store = result_store  # Source for render_from_store()
+        # "dom" renders every row, "virtual" renders rows from a columnar sidecar on demand,
+        # "auto" picks virtual once a host has more than virtual_threshold hits
+        self.report_mode = report_mode
+        self.virtual_threshold = virtual_threshold
+        self.max_connections = max_connections  # Total concurrent redirect lookups
+        self.http_pool = http_pool or HttpSessionPool()  # Also enforces the per-host limit
+        self.categorizer = default_categorizer  # Compiled once per process
+        self.chunk_size = chunk_size  # Hits buffered per redirect-resolution batch
+        self.dashboard = DashboardAggregator(output_dir)  # Fleet-wide index.html, updated per host
+
+    def start_report(self, subdomain, technology, tech_details):
+        """Return a ReportCollector that streams this host's hits into its report."""
+        return ReportCollector(self, subdomain, technology, tech_details)
 
     def generate_report(self, subdomain, results):
         """Generate an HTML report for the scan results."""
+        data = results.get(subdomain, {})
+        report = self.start_report(subdomain, data.get('technology'), data.get('tech_details'))
+        if data.get('fuzz_results'):
+            for item in data['fuzz_results']['results']:
+                report.add(item)
+        report.finish()
+
+    def render_from_store(self, subdomain, technology=None, tech_details=None):
+        """Regenerate a host's report from the findings in the result store."""
+        if self.result_store is None:
+            raise ValueError("ReportGenerator has no result store to render from")
+        report = self.start_report(subdomain, technology, tech_details)
+        for item in self.result_store.findings(subdomain):
+            report.add(item)
+        report.finish()
+
+    def report_path(self, subdomain, suffix=".html"):
         # Sanitize subdomain for filename
         safe_subdomain = subdomain.replace("://", "_").replace(".", "_").replace("/", "_")
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        report_file = os.path.join(self.output_dir, f"report_{safe_subdomain}_.html")
-
-        os.makedirs(self.output_dir, exist_ok=True)
-
-        try:
-            with open(report_file, 'w') as file:
-                file.write(self._generate_html_content(subdomain, results, timestamp))
-            ColorPrint.success(f"Report generated: {report_file}")
-        except Exception as e:
-            ColorPrint.error(f"Error generating report: {str(e)}")
-
-    def _categorize_urls(self, fuzz_results):
-        """Categorize URLs based on patterns"""
-        categories = {
-            'Admin': [],
-            'API': [],
-            'Assets': [],
-            'Auth': [],
-            'Config': [],
-            'Content': [],
-            'Core': [],
-            'Data': [],
-            'Docs': [],
-            'System': [],
-            'User': [],
-            'Dev': [],
-            'Backup': [],
-            'Misc': []
-        }
-
-        patterns = {
-            'Admin': [
-                '/admin', '/manage', '/dashboard', '/control', '/administrator', '/login', '/sysadmin', '/backend',
-                '/admin/', '/manage/', '/dashboard/', '/control/', '/administrator/', '/login/', '/sysadmin/', '/backend/',
-                '/wp-admin', '/wp-login.php', '/cpanel', '/webmail', '/phpmyadmin',
-                r'/admin\d+', r'/manage\d+', r'/control\d+' # Regex for admin/manage/control followed by numbers
-            ],
-            'API': [
-                '/api/', '/rest/', '/graphql', '/endpoint', '/v[0-9]+/', '\\.json$', '\\.xml$',
-                '/api/v[0-9]+/', '/v[0-9]+/api/',
-                r'/api/\w+/\w+',  # Example: /api/users/123
-                r'/v\d+/\w+/\d+'  # Example: /v1/products/456
-            ],
-            'Assets': [
-                '/images/', '/css/', '/js/', '/static/', '/media/', '/assets/', '\\.(png|jpg|jpeg|gif|svg|ico|woff|woff2|ttf|eot|otf)$',
-                '\\.bmp$', '\\.webp$', '\\.mp4$', '\\.avi$', '\\.mov$', '\\.mp3$', '\\.ogg$', '\\.wav$',
-                '/fonts/', '/img/'
-            ],
-            'Auth': [
-                '/login', '/auth/', '/oauth', '/signin', '/signup', '/register', '/logout', '/password',
-                '/log-in', '/sign-in', '/sign-up', '/forgot-password', '/reset-password',
-                '/auth/login', '/auth/register', '/account/login', '/account/register',
-                '\\.aspx$', '\\.php$', '\\.jsp$' # Potential auth pages in different technologies
-            ],
-            'Config': [
-                '/config', '/settings', '/setup', '/env', '\\.conf$', '\\.ini$', '\\.yaml$', '\\.yml$',
-                '\\.toml$', '\\.properties$', '/.env', '/.env.example', '/config.php', '/configuration.ini',
-                '/application.yml', '/appsettings.json'
-            ],
-            'Content': [
-                '/content/', '/posts/', '/articles/', '/pages/', '/blog/',
-                '/news/', '/updates/', '/downloads/', '/public/',
-                r'/\d{4}/\d{2}/\d{2}/' # Year/Month/Day pattern in URLs
-            ],
-            'Core': [
-                '/core/', '/main/', '/base/', '/foundation/',
-                '/includes/', '/libs/', '/src/', '/app/'
-            ],
-            'Data': [
-                '/data/', '/database/', '/storage/', '/cache/', '/dump', '\\.sql$',
-                '\\.csv$', '\\.xls$', '\\.xlsx$', '\\.backup$', '\\.bak$',
-                '/db/', '/sql/'
-            ],
-            'Docs': [
-                '/docs/', '/documentation/', '/help/', '/manual/', '/readme', '\\.pdf$', '\\.txt$',
-                '\\.md$', '/swagger', '/api-docs', '/redoc', '/openapi',
-                'CHANGELOG', 'LICENSE', 'COPYING'
-            ],
-            'System': [
-                '/system/', '/server/', '/service/', '/process/', '/status', '/health',
-                '/info', '/version', '/healthcheck', '/server-status',
-                '\\.log$'
-            ],
-            'User': [
-                '/user/', '/profile/', '/account/', '/member/',
-                '/users/', '/profiles/', '/accounts/', '/members/',
-                '/my-account', '/myprofile'
-            ],
-            'Dev': [
-                '/dev/', '/debug/', '/test/', '/staging/', '/playground/',
-                '\\.git/', '\\.svn/', '\\.docker/', '\\.vscode/',
-                'phpinfo\\.php'
-            ],
-            'Backup': [
-                '\\.backup$', '\\.bak$', '\\.~$', '\\.old$', '\\.orig$',
-                '/backup/', '/backups/'
-            ],
-            'Misc': [
-                '\\.php~', '\\.swp', '\\.swo', '\\.inc', '\\.tpl',
-                '/sitemap\\.xml', '/robots\\.txt', '/crossdomain\\.xml', '/favicon\\.ico'
-            ]
-        }
-
+        return os.path.join(self.output_dir, f"report_{safe_subdomain}_{suffix}")
+
+    def use_virtual_report(self, result_count):
+        if self.report_mode == "auto":
+            return result_count > self.virtual_threshold
+        return self.report_mode == "virtual"
+
+    def write_shared_assets(self):
+        """Write the shared stylesheet and script unless they are already current."""
+        assets = (
+            (self.css_asset, self._get_css_styles()),
+            (self.js_asset, self._get_javascript()),
+            (self.virtual_js_asset, self._get_virtual_javascript())
+        )
+        for name, content in assets:
+            path = os.path.join(self.output_dir, name)
+            if path in _assets_ready:
+                continue
+            try:
+                with open(path, 'r') as f:
+                    current = f.read() == content
+            except OSError:
+                current = False
+            if not current:
+                with atomic_write(path) as f:  # Other workers never see a half-written asset
+                    f.write(content)
+            _assets_ready.add(path)
+
+    def _resolve_redirects(self, fuzz_results):
+        """Resolve redirect targets for a batch of results concurrently.
+
+        ffuf already records `redirectlocation` in its JSON output, so the network
+        is only used for results that lack it and may actually be a redirect.
+        """
+        redirects = {}
+        pending = []
         for item in fuzz_results:
             url = item.get('url')
-            redirect_url = self._get_redirect_url(url)
-            url_data = {'url': url, 'status': item.get('status'), 'length': item.get('length'), 'redirect_url': redirect_url}
-            categorized = False
+            status = item.get('status')
+            if 'redirectlocation' in item:
+                redirects[url] = item['redirectlocation'] or None
+            elif isinstance(status, int) and not 300 <= status < 400:
+                redirects[url] = None
+            else:
+                pending.append(url)
 
-            for category, keywords in patterns.items():
-                if any(keyword in url.lower() for keyword in keywords):
-                    categories[category].append(url_data)
-                    categorized = True
-                    break
+        if not pending:
+            return redirects
 
-            if not categorized:
-                categories['Misc'].append(url_data)
+        max_workers = min(self.max_connections, len(pending))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for url, redirect_url in zip(pending, executor.map(self._get_redirect_url, pending)):
+                redirects[url] = redirect_url
 
-        return categories
+        return redirects
 
     def _get_redirect_url(self, url):
         try:
-            response = requests.get(url, allow_redirects=False, timeout=5)
+            response = self.http_pool.get(url, allow_redirects=False, timeout=5)
             if 300 <= response.status_code < 400 and 'Location' in response.headers:
                 return response.headers['Location']
         except requests.RequestException:
             return None
         return None
 
-    def _generate_html_content(self, subdomain, results, timestamp):
-        """Generate the HTML content for the report in dark mode."""
+    def _render_head(self, subdomain, technology, timestamp, scripts=None):
+        """Render everything from the doctype down to the quick navigation."""
         html = []
         html.append("<!DOCTYPE html>")
         html.append("<html lang='en' class='dark-mode'>")
@@ -157,8 +139,9 @@ class ReportGenerator:
         html.append("<link rel='preconnect' href='https://fonts.gstatic.com' crossorigin>")
         html.append("<link href='https://fonts.googleapis.com/css2?family=Roboto:wght@400;500;700&display=swap' rel='stylesheet'>")
         html.append("<link href='https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css' rel='stylesheet' />")
-        html.append(self._get_css_styles())
-        html.append(self._get_javascript())
+        html.append(f"<link href='{self.css_asset}' rel='stylesheet' />")
+        for script in scripts or [self.js_asset]:
+            html.append(f"<script src='{script}'></script>")
         html.append("</head>")
         html.append("<body>")
         html.append("<div class='container'>")
@@ -167,8 +150,8 @@ class ReportGenerator:
         html.append("<h1 class='report-title'><i class='fas fa-spider'></i> Web Scanner Report</h1>")
         html.append(f"<p class='report-timestamp'>Generated on: {timestamp}</p>")
         html.append(f"<p class='report-target'>Target Subdomain: {subdomain}</p>")
-        if subdomain in results and 'technology' in results[subdomain]:
-            html.append(f"<p class='report-technology'>Detected Technology: {results[subdomain]['technology']}</p>")
+        if technology:
+            html.append(f"<p class='report-technology'>Detected Technology: {technology}</p>")
         html.append("</div>")
         html.append("</header>")
 
@@ -188,11 +171,10 @@ class ReportGenerator:
         html.append("</div>")
         html.append("</nav>")
 
-        # Add summary section
-        html.append(self._generate_summary_section(subdomain, results))
+        return "\n".join(html) + "\n"
 
-        # Add sorting controls
-        html.append("<div class='sorting-controls'>")
+    def _render_sorting_controls(self):
+        html = ["<div class='sorting-controls'>"]
         html.append("<label for='sort-by'>Sort By:</label>")
         html.append("<select id='sort-by'>")
         html.append("<option value=''>-- Select --</option>")
@@ -202,20 +184,11 @@ class ReportGenerator:
         html.append("<option value='size-desc'>Size Desc</option>")
         html.append("</select>")
         html.append("</div>")
-
-        # Add detailed results with categories
-        html.append(self._generate_detailed_results(results))
-
-        html.append("</div>")
-        html.append("</body>")
-        html.append("</html>")
-
-        return "\n".join(html)
+        return "\n".join(html) + "\n"
 
     def _get_javascript(self):
         """Return JavaScript for interactivity"""
-        return """
-        <script>
+        return """\
         document.addEventListener('DOMContentLoaded', function() {
             const searchInput = document.getElementById('urlSearch');
             const getUrlItems = () => document.querySelectorAll('.url-item');
@@ -277,393 +250,537 @@ class ReportGenerator:
                 });
             }
         });
-        </script>
         """
 
     def _get_css_styles(self):
         """Return enhanced CSS styles with larger container and fonts, and color-coded status."""
-        return """
-        <style>
-            /* Futuristic Color Palette */
-            :root {
-                --bg-color: #0B0D17;
-                --text-color: #E0E0E0;
-                --primary-color: #6FFFB0;
-                --secondary-color: #A3D9FF;
-                --accent-color: #FF90E8;
-                --success-color: #00FF7F;
-                --danger-color: #FF4F4F;
-                --warning-color: #FFD700;
-                --info-color: #00BFFF;
-                --border-color: #2E3440;
-                --highlight-color: var(--primary-color);
-                --code-bg: #1E232A;
-            }
+        return """\
+        /* Futuristic Color Palette */
+        :root {
+            --bg-color: #0B0D17;
+            --text-color: #E0E0E0;
+            --primary-color: #6FFFB0;
+            --secondary-color: #A3D9FF;
+            --accent-color: #FF90E8;
+            --success-color: #00FF7F;
+            --danger-color: #FF4F4F;
+            --warning-color: #FFD700;
+            --info-color: #00BFFF;
+            --border-color: #2E3440;
+            --highlight-color: var(--primary-color);
+            --code-bg: #1E232A;
+        }
 
-            body {
-                font-family: 'Roboto', sans-serif;
-                margin: 0;
-                font-size: 1.1rem;
-                background-color: var(--bg-color);
-                color: var(--text-color);
-                transition: background-color 0.3s, color 0.3s;
-            }
+        body {
+            font-family: 'Roboto', sans-serif;
+            margin: 0;
+            font-size: 1.1rem;
+            background-color: var(--bg-color);
+            color: var(--text-color);
+            transition: background-color 0.3s, color 0.3s;
+        }
 
-            .container {
-                width: 90%;
-                max-width: 1600px;
-                margin: 20px auto;
-                padding: 40px;
-                border-radius: 12px;
-                background-color: #1A1E27;
-                box-shadow: 0 0 20px rgba(var(--primary-color-rgb, 111, 255, 176), 0.2);
-                transition: background-color 0.3s, box-shadow 0.3s;
-            }
+        .container {
+            width: 90%;
+            max-width: 1600px;
+            margin: 20px auto;
+            padding: 40px;
+            border-radius: 12px;
+            background-color: #1A1E27;
+            box-shadow: 0 0 20px rgba(var(--primary-color-rgb, 111, 255, 176), 0.2);
+            transition: background-color 0.3s, box-shadow 0.3s;
+        }
 
-            .report-header {
-                text-align: center;
-                margin-bottom: 50px;
-                padding: 30px 0;
-                border-bottom: 2px solid var(--border-color);
-                transition: border-bottom-color 0.3s;
-            }
+        .report-header {
+            text-align: center;
+            margin-bottom: 50px;
+            padding: 30px 0;
+            border-bottom: 2px solid var(--border-color);
+            transition: border-bottom-color 0.3s;
+        }
 
-            .report-title {
-                font-size: 2.8em;
-                margin-bottom: 15px;
-                color: var(--primary-color);
-                text-shadow: 0 0 10px rgba(var(--primary-color-rgb, 111, 255, 176), 0.8);
-            }
+        .report-title {
+            font-size: 2.8em;
+            margin-bottom: 15px;
+            color: var(--primary-color);
+            text-shadow: 0 0 10px rgba(var(--primary-color-rgb, 111, 255, 176), 0.8);
+        }
 
-            .report-title i {
-                margin-right: 15px;
-            }
+        .report-title i {
+            margin-right: 15px;
+        }
 
-            .report-timestamp {
-                font-size: 1.2em;
-                color: var(--secondary-color);
-            }
+        .report-timestamp {
+            font-size: 1.2em;
+            color: var(--secondary-color);
+        }
 
-            .report-target {
-                font-size: 1.2em;
-                color: var(--info-color);
-            }
+        .report-target {
+            font-size: 1.2em;
+            color: var(--info-color);
+        }
 
-            .report-technology {
-                font-size: 1.2em;
-                color: var(--accent-color);
-            }
+        .report-technology {
+            font-size: 1.2em;
+            color: var(--accent-color);
+        }
 
-            .quick-nav {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 40px;
-                padding: 20px 30px;
-                border-radius: 8px;
-                border: 1px solid var(--border-color);
-                background-color: var(--code-bg);
-                transition: background-color 0.3s, border-color 0.3s;
-            }
+        .quick-nav {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 40px;
+            padding: 20px 30px;
+            border-radius: 8px;
+            border: 1px solid var(--border-color);
+            background-color: var(--code-bg);
+            transition: background-color 0.3s, border-color 0.3s;
+        }
 
-            .search-box {
-                display: flex;
-                align-items: center;
-                border: 1px solid var(--border-color);
-                border-radius: 6px;
-                padding-left: 15px;
-                background-color: #2C313A;
-                transition: background-color 0.3s, border-color 0.3s;
-            }
+        .search-box {
+            display: flex;
+            align-items: center;
+            border: 1px solid var(--border-color);
+            border-radius: 6px;
+            padding-left: 15px;
+            background-color: #2C313A;
+            transition: background-color 0.3s, border-color 0.3s;
+        }
 
-            .search-box i {
-                margin-right: 10px;
-                color: var(--secondary-color);
-            }
+        .search-box i {
+            margin-right: 10px;
+            color: var(--secondary-color);
+        }
 
-            .search-box input {
-                border: none;
-                padding: 12px;
-                font-size: 1.1rem;
-                flex-grow: 1;
-                outline: none;
-                background-color: transparent;
-                color: var(--text-color);
-            }
+        .search-box input {
+            border: none;
+            padding: 12px;
+            font-size: 1.1rem;
+            flex-grow: 1;
+            outline: none;
+            background-color: transparent;
+            color: var(--text-color);
+        }
 
-            .category-filters {
-                display: flex;
-                gap: 15px;
-                flex-wrap: wrap;
-                justify-content: center;
-            }
+        .category-filters {
+            display: flex;
+            gap: 15px;
+            flex-wrap: wrap;
+            justify-content: center;
+        }
 
-            .category-button {
-                padding: 12px 25px;
-                border: 1px solid var(--accent-color);
-                border-radius: 25px;
-                background-color: transparent;
-                color: var(--accent-color);
-                cursor: pointer;
-                font-size: 1rem;
-                transition: background-color 0.3s, color 0.3s, border-color 0.3s;
-            }
+        .category-button {
+            padding: 12px 25px;
+            border: 1px solid var(--accent-color);
+            border-radius: 25px;
+            background-color: transparent;
+            color: var(--accent-color);
+            cursor: pointer;
+            font-size: 1rem;
+            transition: background-color 0.3s, color 0.3s, border-color 0.3s;
+        }
 
-            .category-button.active {
-                background-color: var(--accent-color);
-                color: var(--bg-color);
-                border-color: var(--accent-color);
-            }
+        .category-button.active {
+            background-color: var(--accent-color);
+            color: var(--bg-color);
+            border-color: var(--accent-color);
+        }
 
-            .summary {
-                padding: 30px;
-                margin-bottom: 40px;
-                border-left: 5px solid var(--highlight-color);
-                background-color: var(--code-bg);
-                border-radius: 8px;
-                transition: background-color 0.3s, border-color 0.3s;
-            }
+        .summary {
+            padding: 30px;
+            margin-bottom: 40px;
+            border-left: 5px solid var(--highlight-color);
+            background-color: var(--code-bg);
+            border-radius: 8px;
+            transition: background-color 0.3s, border-color 0.3s;
+        }
 
-            .summary h2 {
-                margin-top: 0;
-                margin-bottom: 30px; /* Increased margin */
-                font-size: 2rem; /* Increased font size */
-                color: var(--primary-color);
-                text-align: center; /* Center the title */
-            }
+        .summary h2 {
+            margin-top: 0;
+            margin-bottom: 30px; /* Increased margin */
+            font-size: 2rem; /* Increased font size */
+            color: var(--primary-color);
+            text-align: center; /* Center the title */
+        }
 
-            .stats-grid {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                gap: 30px;
-            }
+        .stats-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 30px;
+        }
 
-            .stat-card {
-                padding: 30px; /* Increased padding */
-                border-radius: 10px; /* Slightly more rounded */
-                border: 1px solid var(--border-color);
-                text-align: center;
-                background-color: #2C313A;
-                color: var(--text-color);
-                transition: background-color 0.3s, border-color 0.3s;
-            }
+        .stat-card {
+            padding: 30px; /* Increased padding */
+            border-radius: 10px; /* Slightly more rounded */
+            border: 1px solid var(--border-color);
+            text-align: center;
+            background-color: #2C313A;
+            color: var(--text-color);
+            transition: background-color 0.3s, border-color 0.3s;
+        }
 
-            .stat-card .stat-title {
-                margin-top: 0;
-                font-size: 1.6rem; /* Increased font size */
-                color: var(--primary-color);
-            }
+        .stat-card .stat-title {
+            margin-top: 0;
+            font-size: 1.6rem; /* Increased font size */
+            color: var(--primary-color);
+        }
 
-            .stat-card .stat-value {
-                font-size: 2.2rem; /* Prominent value */
-                font-weight: bold;
-                margin-bottom: 0;
-            }
+        .stat-card .stat-value {
+            font-size: 2.2rem; /* Prominent value */
+            font-weight: bold;
+            margin-bottom: 0;
+        }
 
-            .status-bar-with-progress {
-                display: flex;
-                align-items: center;
-                margin-bottom: 15px;
-            }
+        .status-bar-with-progress {
+            display: flex;
+            align-items: center;
+            margin-bottom: 15px;
+        }
 
-            .status-label {
-                flex-basis: 20%;
-                font-weight: bold;
-            }
+        .status-label {
+            flex-basis: 20%;
+            font-weight: bold;
+        }
 
-            .progress-bar {
-                flex-grow: 1;
-                height: 10px;
-                background-color: #444954;
-                border-radius: 5px;
-                margin-right: 15px;
-                overflow: hidden;
-            }
+        .progress-bar {
+            flex-grow: 1;
+            height: 10px;
+            background-color: #444954;
+            border-radius: 5px;
+            margin-right: 15px;
+            overflow: hidden;
+        }
 
-            .progress-bar-inner {
-                height: 100%;
-                border-radius: 5px;
-                transition: width 0.4s ease-in-out;
-            }
+        .progress-bar-inner {
+            height: 100%;
+            border-radius: 5px;
+            transition: width 0.4s ease-in-out;
+        }
 
-            .progress-bar-inner.success {
-                background-color: var(--success-color);
-            }
+        .progress-bar-inner.success {
+            background-color: var(--success-color);
+        }
 
-            .progress-bar-inner.info {
-                background-color: var(--info-color);
-            }
+        .progress-bar-inner.info {
+            background-color: var(--info-color);
+        }
 
-            .progress-bar-inner.danger {
-                background-color: var(--danger-color);
-            }
+        .progress-bar-inner.danger {
+            background-color: var(--danger-color);
+        }
 
-            .progress-bar-inner.warning {
-                background-color: var(--warning-color);
-            }
+        .progress-bar-inner.warning {
+            background-color: var(--warning-color);
+        }
 
-            .status-count {
-                flex-basis: 10%;
-                text-align: right;
-            }
+        .status-count {
+            flex-basis: 10%;
+            text-align: right;
+        }
 
-            /* New status count colors for summary */
-            .status-count.success {
-                color: var(--success-color);
-            }
-            .status-count.info {
-                color: var(--info-color);
-            }
-            .status-count.danger {
-                color: var(--danger-color);
-            }
-            .status-count.warning {
-                color: var(--warning-color);
-            }
+        /* New status count colors for summary */
+        .status-count.success {
+            color: var(--success-color);
+        }
+        .status-count.info {
+            color: var(--info-color);
+        }
+        .status-count.danger {
+            color: var(--danger-color);
+        }
+        .status-count.warning {
+            color: var(--warning-color);
+        }
 
-            .detailed-results {
-                margin-top: 50px;
-            }
+        .detailed-results {
+            margin-top: 50px;
+        }
 
-            .detailed-results h2 {
-                margin-bottom: 30px;
-                font-size: 1.7rem;
-                color: var(--primary-color);
-            }
+        .detailed-results h2 {
+            margin-bottom: 30px;
+            font-size: 1.7rem;
+            color: var(--primary-color);
+        }
 
-            .category-section {
-                margin-bottom: 30px;
-                padding: 25px;
-                border-radius: 10px;
-                border-left: 5px solid var(--highlight-color);
-                background-color: var(--code-bg);
-                transition: background-color 0.3s, border-color 0.3s;
-            }
+        .category-section {
+            margin-bottom: 30px;
+            padding: 25px;
+            border-radius: 10px;
+            border-left: 5px solid var(--highlight-color);
+            background-color: var(--code-bg);
+            transition: background-color 0.3s, border-color 0.3s;
+        }
+
+        .category-section h3 {
+            margin-top: 0;
+            margin-bottom: 20px;
+            font-size: 1.5rem;
+            border-bottom: 1px dashed var(--accent-color);
+            padding-bottom: 15px;
+            color: var(--accent-color);
+            transition: color 0.3s, border-bottom-color 0.3s;
+        }
+
+        .url-item {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            padding: 15px 25px;
+            margin-bottom: 12px;
+            border-radius: 6px;
+            border: 1px solid var(--border-color);
+            font-size: 1.1rem;
+            background-color: #2C313A;
+            color: var(--text-color);
+            transition: background-color 0.3s, border-color 0.3s;
+        }
+
+        .url-item:nth-child(even) {
+            background-color: #353A43;
+        }
+
+        .url-item .url {
+            flex-grow: 1;
+            margin-right: 15px;
+            word-break: break-all;
+        }
+
+        .url-item .url a {
+            text-decoration: none;
+            color: var(--info-color);
+            transition: color 0.3s;
+        }
 
-            .category-section h3 {
-                margin-top: 0;
-                margin-bottom: 20px;
-                font-size: 1.5rem;
-                border-bottom: 1px dashed var(--accent-color);
-                padding-bottom: 15px;
-                color: var(--accent-color);
-                transition: color 0.3s, border-bottom-color 0.3s;
+        .url-item .status {
+            padding: 8px 15px;
+            border-radius: 4px;
+            font-size: 1rem;
+            color: var(--bg-color);
+        }
+
+        .url-item .status-200 { background-color: var(--success-color); }
+        .url-item .status-301, .url-item .status-302, .url-item .status-307 { background-color: var(--warning-color); color: #000; }
+        .url-item .status-400, .url-item .status-401, .url-item .status-403, .url-item .status-404 { background-color: var(--danger-color); }
+        .url-item .status-500 { background-color: var(--secondary-color); }
+
+        .url-item .redirect {
+            font-size: 0.9rem;
+            color: var(--warning-color);
+            margin-left: 10px;
+        }
+
+        .sorting-controls {
+            margin-bottom: 40px;
+            text-align: right;
+        }
+
+        .sorting-controls label {
+            margin-right: 10px;
+            font-size: 1.1rem;
+            color: var(--text-color);
+            transition: color 0.3s;
+        }
+
+        .sorting-controls select {
+            padding: 12px;
+            border-radius: 6px;
+            border: 1px solid var(--border-color);
+            font-size: 1.1rem;
+            outline: none;
+            background-color: #2C313A;
+            color: var(--text-color);
+            transition: background-color 0.3s, color 0.3s, border-color 0.3s;
+        }
+
+        /* Virtualized report: only the visible rows are in the DOM */
+        .virtual-count {
+            margin-bottom: 15px;
+            color: var(--secondary-color);
+        }
+
+        .virtual-viewport {
+            height: 75vh;
+            overflow-y: auto;
+            border-radius: 10px;
+            border-left: 5px solid var(--highlight-color);
+            background-color: var(--code-bg);
+        }
+
+        .virtual-spacer {
+            position: relative;
+        }
+
+        .virtual-spacer .url-item {
+            position: absolute;
+            left: 10px;
+            right: 10px;
+            height: 52px;
+            margin: 6px 0;
+            box-sizing: border-box;
+            overflow: hidden;
+            white-space: nowrap;
+        }
+
+        /* Responsive adjustments */
+        @media (max-width: 768px) {
+            .container {
+                padding: 30px;
             }
 
-            .url-item {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                padding: 15px 25px;
-                margin-bottom: 12px;
-                border-radius: 6px;
-                border: 1px solid var(--border-color);
-                font-size: 1.1rem;
-                background-color: #2C313A;
-                color: var(--text-color);
-                transition: background-color 0.3s, border-color 0.3s;
+            .quick-nav {
+                flex-direction: column;
+                align-items: stretch;
             }
 
-            .url-item:nth-child(even) {
-                background-color: #353A43;
+            .search-box {
+                margin-bottom: 15px;
             }
 
-            .url-item .url {
-                flex-grow: 1;
-                margin-right: 15px;
-                word-break: break-all;
+            .category-filters {
+                justify-content: space-around;
             }
 
-            .url-item .url a {
-                text-decoration: none;
-                color: var(--info-color);
-                transition: color 0.3s;
+            .category-button {
+                flex-grow: 0;
+                width: auto;
             }
 
-            .url-item .status {
-                padding: 8px 15px;
-                border-radius: 4px;
-                font-size: 1rem;
-                color: var(--bg-color);
+            .stats-grid {
+                grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
             }
+        }
+        """
 
-            .url-item .status-200 { background-color: var(--success-color); }
-            .url-item .status-301, .url-item .status-302, .url-item .status-307 { background-color: var(--warning-color); color: #000; }
-            .url-item .status-400, .url-item .status-401, .url-item .status-403, .url-item .status-404 { background-color: var(--danger-color); }
-            .url-item .status-500 { background-color: var(--secondary-color); }
+    def _get_virtual_javascript(self):
+        """Return JavaScript for the virtualized report.
 
-            .url-item .redirect {
-                font-size: 0.9rem;
-                color: var(--warning-color);
-                margin-left: 10px;
+        Rows come from window.REPORT_DATA (columnar arrays written to a sidecar
+        file). Search, category filters and sorting work on index arrays and
+        only the rows inside the viewport exist in the DOM.
+        """
+        return """\
+        document.addEventListener('DOMContentLoaded', function() {
+            const data = window.REPORT_DATA;
+            const total = data.url.length;
+            const status = Int32Array.from(data.status);
+            const size = Float64Array.from(data.length, v => v === null ? -1 : v);
+            const category = Uint16Array.from(data.category);
+            const categoryNames = data.categories.map(name => name.toLowerCase());
+            const filterNames = Array.from(document.querySelectorAll('.category-filters .category-button'))
+                .map(button => button.dataset.category);
+            const urlLower = data.url.map(url => url.toLowerCase());
+
+            const viewport = document.getElementById('virtual-viewport');
+            const spacer = document.getElementById('virtual-spacer');
+            const counter = document.getElementById('virtual-count');
+            const rowHeight = 64;
+            const overscan = 10;
+
+            let searchTerm = '';
+            let activeCategory = 'all';
+            let sortType = 'status-asc';
+            let view = new Uint32Array(0);
+
+            function matchesCategory(index) {
+                if (activeCategory === 'all') return true;
+                const name = categoryNames[category[index]];
+                if (activeCategory === 'other') return !filterNames.includes(name);
+                return name === activeCategory;
             }
 
-            .sorting-controls {
-                margin-bottom: 40px;
-                text-align: right;
+            function rebuildView() {
+                const indexes = [];
+                for (let i = 0; i < total; i++) {
+                    if (matchesCategory(i) && (!searchTerm || urlLower[i].includes(searchTerm))) indexes.push(i);
+                }
+                view = Uint32Array.from(indexes);
+                const key = sortType.startsWith('size') ? size : status;
+                const direction = sortType.endsWith('desc') ? -1 : 1;
+                if (sortType) view.sort((a, b) => (key[a] - key[b]) * direction || a - b);
+                spacer.style.height = (view.length * rowHeight) + 'px';
+                counter.textContent = view.length + ' of ' + total + ' results';
+                render();
             }
 
-            .sorting-controls label {
-                margin-right: 10px;
-                font-size: 1.1rem;
-                color: var(--text-color);
-                transition: color 0.3s;
+            function formatBytes(bytes) {
+                if (bytes < 0) return 'N/A';
+                if (bytes >= 1024 * 1024) return (bytes / (1024 * 1024)).toFixed(2) + ' MB';
+                if (bytes >= 1024) return (bytes / 1024).toFixed(2) + ' KB';
+                return bytes + ' bytes';
             }
 
-            .sorting-controls select {
-                padding: 12px;
-                border-radius: 6px;
-                border: 1px solid var(--border-color);
-                font-size: 1.1rem;
-                outline: none;
-                background-color: #2C313A;
-                color: var(--text-color);
-                transition: background-color 0.3s, color 0.3s, border-color 0.3s;
+            function renderRow(index, position) {
+                const row = document.createElement('div');
+                row.className = 'url-item';
+                row.style.top = (position * rowHeight) + 'px';
+                const link = document.createElement('a');
+                link.href = data.url[index];
+                link.target = '_blank';
+                link.textContent = data.url[index];
+                const url = document.createElement('span');
+                url.className = 'url';
+                url.appendChild(link);
+                const code = document.createElement('span');
+                code.className = 'status status-' + status[index];
+                code.textContent = status[index];
+                const bytes = document.createElement('span');
+                bytes.className = 'size';
+                bytes.textContent = formatBytes(size[index]);
+                row.append(url, code, bytes);
+                if (data.redirect[index]) {
+                    const redirect = document.createElement('span');
+                    redirect.className = 'redirect';
+                    redirect.textContent = '\u21aa ' + data.redirect[index];
+                    row.appendChild(redirect);
+                }
+                return row;
             }
 
-            /* Responsive adjustments */
-            @media (max-width: 768px) {
-                .container {
-                    padding: 30px;
+            function render() {
+                const first = Math.max(0, Math.floor(viewport.scrollTop / rowHeight) - overscan);
+                const last = Math.min(view.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / rowHeight) + overscan);
+                const rows = document.createDocumentFragment();
+                for (let position = first; position < last; position++) {
+                    rows.appendChild(renderRow(view[position], position));
                 }
+                spacer.replaceChildren(rows);
+            }
 
-                .quick-nav {
-                    flex-direction: column;
-                    align-items: stretch;
-                }
+            let searchTimer = null;
+            document.getElementById('urlSearch').addEventListener('input', function(e) {
+                clearTimeout(searchTimer);
+                searchTimer = setTimeout(() => {
+                    searchTerm = e.target.value.toLowerCase();
+                    rebuildView();
+                }, 150);
+            });
 
-                .search-box {
-                    margin-bottom: 15px;
-                }
+            const categoryButtons = document.querySelectorAll('.category-filters .category-button');
+            categoryButtons.forEach(button => {
+                button.addEventListener('click', function() {
+                    categoryButtons.forEach(btn => btn.classList.remove('active'));
+                    this.classList.add('active');
+                    activeCategory = this.dataset.category;
+                    rebuildView();
+                });
+            });
 
-                .category-filters {
-                    justify-content: space-around;
-                }
+            document.getElementById('sort-by').addEventListener('change', function() {
+                sortType = this.value;
+                rebuildView();
+            });
 
-                .category-button {
-                    flex-grow: 0;
-                    width: auto;
-                }
+            let frame = null;
+            viewport.addEventListener('scroll', function() {
+                if (frame === null) frame = requestAnimationFrame(() => { frame = null; render(); });
+            });
 
-                .stats-grid {
-                    grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-                }
-            }
-        </style>
+            rebuildView();
+        });
         """
 
-    def _generate_summary_section(self, subdomain, results):
+    def _render_summary(self, total_urls, status_codes):
         """Generate an enhanced summary section with statistics and color-coded status."""
-        total_urls = 0
-        status_codes = {}
-
-        for sub, data in results.items():
-            if 'fuzz_results' in data and data['fuzz_results']:
-                for item in data['fuzz_results']['results']:
-                    total_urls += 1
-                    status = item.get('status', 'unknown')
-                    status_codes[status] = status_codes.get(status, 0) + 1
-
         html = ["<div class='summary'>"]
         html.append("<h2>Scan Summary</h2>")
 
@@ -702,7 +819,7 @@ class ReportGenerator:
         html.append("</div>")
         html.append("</div>")
 
-        return "\n".join(html)
+        return "\n".join(html) + "\n"
 
     def _format_bytes(self, size_in_bytes):
         """Convert bytes to human-readable format (KB, MB)."""
@@ -715,38 +832,210 @@ class ReportGenerator:
         else:
             return "N/A"
 
-    def _generate_detailed_results(self, results):
-        """Generate detailed results with categorized URLs and human-readable sizes."""
-        html = ["<div class='detailed-results'>"]
-        html.append("<h2>Detailed Results</h2>")
-
-        for subdomain, data in results.items():
-            if 'fuzz_results' in data and data['fuzz_results']:
-                categorized_results = self._categorize_urls(data['fuzz_results']['results'])
-
-                for category, urls in sorted(categorized_results.items()):
-                    if urls:  # Only show categories with results
-                        html.append(f"<div class='category-section' data-category='{category.lower()}'>")
-                        html.append(f"<h3>{category}</h3>")
-
-                        # Sort URLs by status code in ascending order by default
-                        for url_data in sorted(urls, key=lambda x: x.get('status', float('inf'))):
-                            status_class = f"status-{url_data.get('status', 'unknown')}"
-                            size_bytes = url_data.get('length')
-                            formatted_size = self._format_bytes(size_bytes)
-                            redirect_info = f"<span class='redirect'>↪ {url_data['redirect_url']}</span>" if url_data.get('redirect_url') else ""
-                            html.append(f"""
+    def _render_url_item(self, url_data):
+        """Render one result row with a human-readable size."""
+        status_class = f"status-{url_data.get('status', 'unknown')}"
+        size_bytes = url_data.get('length')
+        formatted_size = self._format_bytes(size_bytes)
+        redirect_info = f"<span class='redirect'>↪ {url_data['redirect_url']}</span>" if url_data.get('redirect_url') else ""
+        return f"""
                                 <div class='url-item'>
                                     <span class='url'><a href='{url_data['url']}' target='_blank'>{url_data['url']}</a></span>
                                     <span class='status {status_class}'>{url_data.get('status', 'Unknown')}</span>
                                     <span class='size' data-bytes='{size_bytes}'>{formatted_size}</span>
                                     {redirect_info}
                                 </div>
-                            """)
+                            """
+
+
+class ReportCollector:
+    """Streams a host's fuzz hits into its report with bounded memory.
+
+    Hits are spilled to temporary buckets per (category, status) and
+    replayed in order by finish().
+    """
+    spill_threshold = 256 * 1024  # Bytes a bucket keeps in memory before moving to disk
+    max_dashboard_paths = 200  # Interesting paths one host contributes to the dashboard
+
+    def __init__(self, report_generator, subdomain, technology, tech_details):
+        self.report_generator = report_generator
+        self.subdomain = subdomain
+        self.technology = technology
+        self.tech_details = tech_details
+        self.count = 0
+        self.status_codes = {}
+        self.categories = {}
+        self.interesting_paths = set()  # Capped at max_dashboard_paths for the dashboard
+        self._pending = []  # Hits waiting for a batched redirect lookup
+        self._buckets = {}  # (category, status) -> spill file of JSON rows
+
+    def add(self, item):
+        self.count += 1
+        status = item.get('status', 'unknown')
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+
+        self._pending.append({field: item[field] for field in ('url', 'status', 'length', 'redirectlocation') if field in item})
+        if len(self._pending) >= self.report_generator.chunk_size:
+            self._flush_pending()
+
+    def _flush_pending(self):
+        generator = self.report_generator
+        redirects = generator._resolve_redirects(self._pending)
+        for item in self._pending:
+            url = item.get('url')
+            url_data = {'url': url, 'status': item.get('status'), 'length': item.get('length'), 'redirect_url': redirects.get(url)}
+            category = generator.categorizer.categorize(url)
+            self._summarize(category, url, item.get('status'))
+            key = (category, item.get('status'))
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = tempfile.SpooledTemporaryFile(
+                    max_size=self.spill_threshold, mode='w+', encoding='utf-8'
+                )
+            bucket.write(json.dumps(url_data) + "\n")
+        self._pending = []
+
+    def _summarize(self, category, url, status):
+        self.categories[category] = self.categories.get(category, 0) + 1
+        if (category in self.report_generator.dashboard.interesting_categories
+                and isinstance(status, int) and (status < 400 or status in (401, 403))
+                and len(self.interesting_paths) < self.max_dashboard_paths):
+            self.interesting_paths.add(urlsplit(url or '').path or '/')
+
+    def _ordered_rows(self):
+        """Yield (category, url_data) grouped by category, ascending status within each."""
+        by_category = {}
+        for category, status in self._buckets:
+            by_category.setdefault(category, []).append(status)
+
+        for category in sorted(by_category):
+            # Rows are bucketed by status, so ascending status order costs nothing
+            for status in sorted(by_category[category], key=lambda s: s if isinstance(s, int) else float('inf')):
+                bucket = self._buckets[(category, status)]
+                bucket.seek(0)
+                for line in bucket:
+                    yield category, json.loads(line)
+
+    def finish(self, dashboard=True):
+        """Write the report for everything collected so far.
+
+        `dashboard=False` leaves the fleet dashboard alone, for interim
+        reports of a host that will be reported again and for directory
+        runs, which are folded into their host's entry by the caller.
+        Returns the host's dashboard summary, or None if the report failed.
+        """
+        generator = self.report_generator
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        report_file = generator.report_path(self.subdomain)
+        data_file = generator.report_path(self.subdomain, ".data.js")
+        virtual = generator.use_virtual_report(self.count)
 
-                        html.append("</div>")
-            else:
-                html.append("<p>No fuzzing results found for this subdomain.</p>")
+        try:
+            self._flush_pending()
+            os.makedirs(generator.output_dir, exist_ok=True)
+            generator.write_shared_assets()
+
+            # Both files move into place only once the report is complete, the sidecar first
+            with ExitStack() as pending:
+                file = pending.enter_context(atomic_write(report_file))
+                if virtual:
+                    self._write_data_sidecar(pending.enter_context(atomic_write(data_file)))
+                    scripts = [os.path.basename(data_file), generator.virtual_js_asset]
+                else:
+                    scripts = [generator.js_asset]
+
+                file.write(generator._render_head(self.subdomain, self.technology, timestamp, scripts))
+                file.write(generator._render_summary(self.count, self.status_codes))
+                file.write(generator._render_sorting_controls())
+                if virtual:
+                    self._write_virtual_results(file)
+                else:
+                    self._write_detailed_results(file)
+                file.write("</div>\n</body>\n</html>")
+
+            if not virtual and os.path.exists(data_file):
+                os.remove(data_file)  # Stale sidecar from an earlier, larger run
+            ColorPrint.success(f"Report generated: {report_file}")
+            summary = {
+                'host': self.subdomain,
+                'technology': self.technology,
+                'report': os.path.basename(report_file),
+                'total': self.count,
+                'status_codes': self.status_codes,
+                'categories': self.categories,
+                'interesting_paths': sorted(self.interesting_paths)
+            }
+            if dashboard:
+                generator.dashboard.record_host(summary)
+            return summary
+        except Exception as e:
+            ColorPrint.error(f"Error generating report: {str(e)}")
+            return None
+        finally:
+            for bucket in self._buckets.values():
+                bucket.close()
+            self._buckets = {}
+
+    def _write_detailed_results(self, file):
+        """Write every row as DOM markup, one section per category."""
+        file.write("<div class='detailed-results'>\n<h2>Detailed Results</h2>\n")
+        if not self.count:
+            file.write("<p>No fuzzing results found for this subdomain.</p>\n")
+
+        current = None
+        for category, url_data in self._ordered_rows():
+            if category != current:
+                if current is not None:
+                    file.write("</div>\n")
+                file.write(f"<div class='category-section' data-category='{category.lower()}'>\n")
+                file.write(f"<h3>{category}</h3>\n")
+                current = category
+            file.write(self.report_generator._render_url_item(url_data))
+        if current is not None:
+            file.write("</div>\n")
+
+        file.write("</div>\n")
+
+    def _write_virtual_results(self, file):
+        """Write the scroll viewport that the virtual report script fills in."""
+        file.write("<div class='detailed-results'>\n<h2>Detailed Results</h2>\n")
+        file.write("<p class='virtual-count' id='virtual-count'></p>\n")
+        file.write("<div class='virtual-viewport' id='virtual-viewport'><div class='virtual-spacer' id='virtual-spacer'></div></div>\n")
+        file.write("</div>\n")
+
+    def _write_data_sidecar(self, file):
+        """Write the results as columnar arrays assigned to window.REPORT_DATA.
+
+        A script file rather than JSON so the report also works when opened
+        from disk (file:// pages cannot fetch sidecars). Each column is spilled
+        to its own temp file in a single pass over the buckets, then stitched
+        together into `file`.
+        """
+        categories = self.report_generator.categorizer.categories
+        category_index = {category: index for index, category in enumerate(categories)}
+        columns = {name: tempfile.TemporaryFile(mode='w+', encoding='utf-8') for name in ('url', 'status', 'length', 'category', 'redirect')}
 
-        html.append("</div>")
-        return "\n".join(html)
\ No newline at end of file
+        try:
+            separator = ""
+            for category, url_data in self._ordered_rows():
+                columns['url'].write(separator + json.dumps(url_data['url']))
+                columns['status'].write(separator + json.dumps(url_data['status']))
+                columns['length'].write(separator + json.dumps(url_data['length']))
+                columns['category'].write(separator + str(category_index[category]))
+                columns['redirect'].write(separator + json.dumps(url_data['redirect_url'] or ""))
+                separator = ","
+
+            file.write(f"window.REPORT_DATA = {{\"categories\": {json.dumps(categories)}")
+            for name, column in columns.items():
+                column.seek(0)
+                file.write(f", \"{name}\": [")
+                while True:
+                    chunk = column.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    file.write(chunk)
+                file.write("]")
+            file.write("};\n")
+        finally:
+            for column in columns.values():
+                column.close()
@@ -0,0 +1,138 @@
+# reporting/url_categorizer.py
+import re
+
+# Checked in order; the first category with a matching entry wins and anything
+# unmatched falls into Misc. Entries containing regex syntax are regexes, the
+# rest are plain substrings. URLs are lowercased before matching, so regex
+# entries must be written in lowercase.
+CATEGORY_PATTERNS = {
+    'Admin': [
+        '/admin', '/manage', '/dashboard', '/control', '/administrator', '/login', '/sysadmin', '/backend',
+        '/admin/', '/manage/', '/dashboard/', '/control/', '/administrator/', '/login/', '/sysadmin/', '/backend/',
+        '/wp-admin', '/wp-login.php', '/cpanel', '/webmail', '/phpmyadmin',
+        r'/admin\d+', r'/manage\d+', r'/control\d+' # Regex for admin/manage/control followed by numbers
+    ],
+    'API': [
+        '/api/', '/rest/', '/graphql', '/endpoint', '/v[0-9]+/', '\\.json$', '\\.xml$',
+        '/api/v[0-9]+/', '/v[0-9]+/api/',
+        r'/api/\w+/\w+',  # Example: /api/users/123
+        r'/v\d+/\w+/\d+'  # Example: /v1/products/456
+    ],
+    'Assets': [
+        '/images/', '/css/', '/js/', '/static/', '/media/', '/assets/', '\\.(png|jpg|jpeg|gif|svg|ico|woff|woff2|ttf|eot|otf)$',
+        '\\.bmp$', '\\.webp$', '\\.mp4$', '\\.avi$', '\\.mov$', '\\.mp3$', '\\.ogg$', '\\.wav$',
+        '/fonts/', '/img/'
+    ],
+    'Auth': [
+        '/login', '/auth/', '/oauth', '/signin', '/signup', '/register', '/logout', '/password',
+        '/log-in', '/sign-in', '/sign-up', '/forgot-password', '/reset-password',
+        '/auth/login', '/auth/register', '/account/login', '/account/register',
+        '\\.aspx$', '\\.php$', '\\.jsp$' # Potential auth pages in different technologies
+    ],
+    'Config': [
+        '/config', '/settings', '/setup', '/env', '\\.conf$', '\\.ini$', '\\.yaml$', '\\.yml$',
+        '\\.toml$', '\\.properties$', '/.env', '/.env.example', '/config.php', '/configuration.ini',
+        '/application.yml', '/appsettings.json'
+    ],
+    'Content': [
+        '/content/', '/posts/', '/articles/', '/pages/', '/blog/',
+        '/news/', '/updates/', '/downloads/', '/public/',
+        r'/\d{4}/\d{2}/\d{2}/' # Year/Month/Day pattern in URLs
+    ],
+    'Core': [
+        '/core/', '/main/', '/base/', '/foundation/',
+        '/includes/', '/libs/', '/src/', '/app/'
+    ],
+    'Data': [
+        '/data/', '/database/', '/storage/', '/cache/', '/dump', '\\.sql$',
+        '\\.csv$', '\\.xls$', '\\.xlsx$', '\\.backup$', '\\.bak$',
+        '/db/', '/sql/'
+    ],
+    'Docs': [
+        '/docs/', '/documentation/', '/help/', '/manual/', '/readme', '\\.pdf$', '\\.txt$',
+        '\\.md$', '/swagger', '/api-docs', '/redoc', '/openapi',
+        'CHANGELOG', 'LICENSE', 'COPYING'
+    ],
+    'System': [
+        '/system/', '/server/', '/service/', '/process/', '/status', '/health',
+        '/info', '/version', '/healthcheck', '/server-status',
+        '\\.log$'
+    ],
+    'User': [
+        '/user/', '/profile/', '/account/', '/member/',
+        '/users/', '/profiles/', '/accounts/', '/members/',
+        '/my-account', '/myprofile'
+    ],
+    'Dev': [
+        '/dev/', '/debug/', '/test/', '/staging/', '/playground/',
+        '\\.git/', '\\.svn/', '\\.docker/', '\\.vscode/',
+        'phpinfo\\.php'
+    ],
+    'Backup': [
+        '\\.backup$', '\\.bak$', '\\.~$', '\\.old$', '\\.orig$',
+        '/backup/', '/backups/'
+    ],
+    'Misc': [
+        '\\.php~', '\\.swp', '\\.swo', '\\.inc', '\\.tpl',
+        '/sitemap\\.xml', '/robots\\.txt', '/crossdomain\\.xml', '/favicon\\.ico'
+    ]
+}
+
+
+class UrlCategorizer:
+    """Assigns URLs to report categories using matchers built once.
+
+    Each category's keywords and regexes are compiled into one pattern,
+    tried in the original precedence order.
+    """
+    regex_syntax = re.compile(r'[\\\[\](){}^$*+?|]')
+    fallback = 'Misc'
+
+    def __init__(self, patterns=None):
+        patterns = patterns or CATEGORY_PATTERNS
+        self.categories = list(patterns)
+        if self.fallback not in self.categories:
+            self.categories.append(self.fallback)
+        # Bound search methods, in precedence order
+        self._matchers = [
+            (category, self._compile(keywords).search) for category, keywords in patterns.items() if keywords
+        ]
+
+    def _compile(self, keywords):
+        literals = [keyword.lower() for keyword in keywords if not self.regex_syntax.search(keyword)]
+        regexes = [keyword for keyword in keywords if self.regex_syntax.search(keyword)]
+        alternatives = [f"(?:{regex})" for regex in regexes]
+        if literals:
+            alternatives.insert(0, self._trie_pattern(literals))
+        # Case-sensitive on purpose: IGNORECASE disables re's fast literal-prefix search
+        return re.compile("|".join(alternatives))
+
+    def _trie_pattern(self, words):
+        """Build a regex matching any of `words`, factoring out shared prefixes."""
+        trie = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}  # End of a word
+
+        def render(node):
+            if '' in node:
+                # A word ends here; as a substring test, longer continuations add nothing
+                return ''
+            branches = [re.escape(char) + render(child) for char, child in sorted(node.items())]
+            return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+        return render(trie)
+
+    def categorize(self, url):
+        """Return the first category whose keywords match `url`."""
+        url = url.lower()
+        for category, search in self._matchers:
+            if search(url):
+                return category
+        return self.fallback
+
+
+# Built once at import and shared by every report
+default_categorizer = UrlCategorizer()
@@ -0,0 +1,147 @@
+# scanners/calibration.py
+import re
+import random
+import string
+import asyncio
+import hashlib
+from utils.color_print import ColorPrint
+
+_TOKEN = re.compile(rb"[A-Za-z0-9_]{2,}")
+
+
+def simhash(body, max_tokens=1024):
+    """64-bit simhash of a response body's word tokens; near-identical pages differ in few bits."""
+    tokens = set(_TOKEN.findall(body[:65536]))
+    if not tokens:
+        return 0
+    hashes = [int.from_bytes(hashlib.blake2b(token, digest_size=8).digest(), "big") for token in list(tokens)[:max_tokens]]
+    threshold = len(hashes) / 2
+    value = 0
+    for bit in range(64):
+        if sum((h >> bit) & 1 for h in hashes) > threshold:
+            value |= 1 << bit
+    return value
+
+
+class Calibrator:
+    """Soft-404 detection for one host, run before fuzzing starts.
+
+    Responses to random paths form the baseline that hits are compared
+    against. A cluster of more than `cluster_limit` identical hits is
+    only dropped if random paths shaped like it reproduce it.
+    """
+    probe_templates = ("{}", "{}.php", "{}.html", "{}/", "admin{}", ".htaccess{}")
+    passthrough_statuses = (429, 503)
+    mask = "{FUZZ}"
+    confirm_probes = 2
+
+    def __init__(self, max_distance=6, length_tolerance=0.2, cluster_limit=50):
+        self.max_distance = max_distance
+        self.length_tolerance = length_tolerance
+        self.cluster_limit = cluster_limit
+        self.baseline = []  # (status, length, words, lines, masked redirect, simhash)
+        self.dropped = 0
+        self._clusters = {}  # (status, words, lines) -> hits seen
+        self._verdicts = {}  # suspect cluster -> task resolving to whether it is a wildcard
+        self._engine = self._base_url = self._headers = None
+
+    async def calibrate(self, engine, base_url, headers=None):
+        """Probe random paths on `base_url` with an AsyncHttpEngine and record the baseline."""
+        base_url = base_url.rstrip("/")
+        self._engine, self._base_url, self._headers = engine, base_url, headers
+        for template in self.probe_templates:
+            token = self._token()
+            try:
+                response = await engine.request("GET", f"{base_url}/{template.format(token)}", headers)
+            except (OSError, asyncio.TimeoutError, ValueError):
+                continue
+            body = response.body
+            self.baseline.append((
+                response.status,
+                response.length,
+                len(body.split(b" ")),
+                len(body.split(b"\n")),
+                response.headers.get("location", "").replace(token, self.mask),
+                simhash(body)
+            ))
+        return self
+
+    async def is_noise(self, item, body=None):
+        """Whether a hit (an ffuf-style dict, plus its body if known) is a soft-404."""
+        status = item.get("status")
+        if status in self.passthrough_statuses:
+            return False
+        if self._matches_baseline(item, body):
+            self.dropped += 1
+            return True
+        if isinstance(status, int) and 300 <= status < 400:
+            return False  # Real directories all redirect alike; only the baseline judges redirects
+        key = (status, item.get("words"), item.get("lines"))
+        seen = self._clusters[key] = self._clusters.get(key, 0) + 1
+        if seen <= self.cluster_limit:
+            return False
+        verdict = self._verdicts.get(key)
+        if verdict is None:
+            verdict = self._verdicts[key] = asyncio.ensure_future(self._confirm_cluster(key, item))
+        if await asyncio.shield(verdict):
+            self.dropped += 1
+            return True
+        return False
+
+    async def _confirm_cluster(self, key, item):
+        """Probe random paths shaped like a suspect cluster's hit; a wildcard reproduces the cluster."""
+        word = (item.get("input") or {}).get("FUZZ") or ""
+        status, words, lines = key
+        reproduced = False
+        if self._engine is not None:
+            for _ in range(self.confirm_probes):
+                try:
+                    response = await self._engine.request("GET", f"{self._base_url}/{self._shaped_like(word)}", self._headers)
+                except (OSError, asyncio.TimeoutError, ValueError):
+                    continue
+                body = response.body
+                if (response.status, len(body.split(b" ")), len(body.split(b"\n"))) == key:
+                    reproduced = True
+                    break
+        host = self._base_url or item.get("host", "")
+        if reproduced:
+            ColorPrint.warning(
+                f"Over {self.cluster_limit} {status} responses of {words} words / {lines} lines on {host}, "
+                f"and random paths shaped like '{word}' return the same; dropping the rest as a wildcard."
+            )
+        else:
+            ColorPrint.info(
+                f"Over {self.cluster_limit} {status} responses of {words} words / {lines} lines on {host}, "
+                f"but random paths shaped like '{word}' do not reproduce them; keeping them all."
+            )
+        return reproduced
+
+    def _token(self):
+        return "".join(random.choices(string.ascii_lowercase + string.digits, k=16))
+
+    def _shaped_like(self, word):
+        """A random path with the word's directories, extension and trailing slash."""
+        head, slash, name = word.rstrip("/").rpartition("/")
+        _, dot, extension = name.partition(".")
+        return f"{head}{slash}{self._token()}{dot}{extension}" + ("/" if word.endswith("/") else "")
+
+    def _matches_baseline(self, item, body):
+        status, length = item.get("status"), item.get("length")
+        words, lines = item.get("words"), item.get("lines")
+        word = (item.get("input") or {}).get("FUZZ")
+        location = item.get("redirectlocation") or ""
+        if word and location:
+            location = location.replace(word, self.mask)
+
+        for base_status, base_length, base_words, base_lines, base_location, base_hash in self.baseline:
+            if status != base_status:
+                continue
+            if length == base_length or (words == base_words and lines == base_lines):
+                return True
+            if location and location == base_location:
+                return True
+            if (body is not None and base_length and length is not None
+                    and abs(length - base_length) <= base_length * self.length_tolerance
+                    and bin(simhash(body) ^ base_hash).count("1") <= self.max_distance):
+                return True
+        return False
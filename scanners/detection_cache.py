@@ -0,0 +1,106 @@
+# scanners/detection_cache.py
+import os
+import json
+import time
+from scanners.fingerprint_db import DEFAULT_CACHE_DIR
+from utils.sqlite_db import SqliteDatabase
+
+class DetectionCache(SqliteDatabase):
+    """Persistent cache of technology detection results, keyed by host.
+
+    Past `ttl` an entry is only reused if the landing page still hashes
+    the same; it also keeps the host profile measured while detecting.
+    """
+    counters = ("hits", "misses", "content_hits")
+    schema = """
+        CREATE TABLE IF NOT EXISTS detections (
+            host TEXT PRIMARY KEY,
+            body_hash TEXT,
+            favicon_hash TEXT,
+            technology TEXT NOT NULL,
+            tech_details TEXT NOT NULL,
+            created REAL NOT NULL,
+            last_used REAL NOT NULL,
+            profile TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_detections_content ON detections (body_hash, favicon_hash);
+        CREATE INDEX IF NOT EXISTS idx_detections_used ON detections (last_used);
+        CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+    """
+
+    def __init__(self, path=None, ttl=7 * 24 * 3600, max_entries=50000, busy_timeout=30):
+        super().__init__(path or os.path.join(DEFAULT_CACHE_DIR, "detections.db"), busy_timeout)
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    def _migrate(self, conn):
+        if "profile" not in {row[1] for row in conn.execute("PRAGMA table_info(detections)")}:
+            conn.execute("ALTER TABLE detections ADD COLUMN profile TEXT")  # Caches from before profiles
+
+    def get(self, host):
+        """Return (technology, tech_details, fresh, body_hash, profile) for a host, or None."""
+        with self._lock:
+            conn = self.conn
+            row = conn.execute(
+                "SELECT technology, tech_details, created, body_hash, profile FROM detections WHERE host = ?", (host,)
+            ).fetchone()
+            if row is None:
+                return None
+            with conn:
+                conn.execute("UPDATE detections SET last_used = ? WHERE host = ?", (time.time(), host))
+        technology, tech_details, created, body_hash, profile = row
+        fresh = time.time() - created < self.ttl
+        return technology, json.loads(tech_details), fresh, body_hash, json.loads(profile) if profile else None
+
+    def find_by_content(self, body_hash, favicon_hash=None):
+        """Return tech_details of a fresh entry computed from the same landing page, or None."""
+        if not body_hash:
+            return None
+        query = "SELECT tech_details FROM detections WHERE body_hash = ? AND created > ?"
+        params = [body_hash, time.time() - self.ttl]
+        if favicon_hash:
+            query += " AND favicon_hash = ?"
+            params.append(favicon_hash)
+        with self._lock:
+            row = self.conn.execute(query + " ORDER BY created DESC LIMIT 1", params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, host, technology, tech_details, body_hash=None, favicon_hash=None, profile=None):
+        now = time.time()
+        with self._lock:
+            conn = self.conn
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO detections "
+                    "(host, body_hash, favicon_hash, technology, tech_details, created, last_used, profile) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (host, body_hash, favicon_hash, technology, json.dumps(tech_details), now, now,
+                     json.dumps(profile) if profile else None)
+                )
+                # LRU eviction: drop whatever lies past the newest max_entries uses
+                conn.execute(
+                    "DELETE FROM detections WHERE last_used < ("
+                    "SELECT last_used FROM detections ORDER BY last_used DESC LIMIT 1 OFFSET ?)",
+                    (self.max_entries - 1,)
+                )
+
+    def record(self, counter):
+        """Bump one of the hit/miss counters."""
+        with self._lock:
+            conn = self.conn
+            with conn:
+                conn.execute(
+                    "INSERT INTO counters (name, value) VALUES (?, 1) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+                    (counter,)
+                )
+
+    def stats(self):
+        """Return the hit/miss counters along with the number of cached hosts."""
+        with self._lock:
+            conn = self.conn
+            values = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            entries = conn.execute("SELECT COUNT(*) FROM detections").fetchone()[0]
+        stats = {counter: values.get(counter, 0) for counter in self.counters}
+        stats["entries"] = entries
+        return stats
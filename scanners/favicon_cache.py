@@ -0,0 +1,130 @@
+# scanners/favicon_cache.py
+import os
+import json
+import time
+import socket
+import hashlib
+from urllib.parse import urlsplit
+from scanners.fingerprint_db import DEFAULT_CACHE_DIR
+from utils.sqlite_db import SqliteDatabase
+
+class FaviconCache(SqliteDatabase):
+    """Fetches favicons once per origin and hashes each distinct payload once.
+
+    Refetches are conditional, reusing the validators of the host or of
+    another host on the same IP; hashes are stored per payload digest.
+    """
+    schema = """
+        CREATE TABLE IF NOT EXISTS sources (
+            key TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            digest TEXT,
+            fetched REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS hashes (digest TEXT PRIMARY KEY, hashes TEXT NOT NULL);
+    """
+
+    def __init__(self, path=None, ttl=24 * 3600, busy_timeout=30):
+        super().__init__(path or os.path.join(DEFAULT_CACHE_DIR, "favicons.db"), busy_timeout)
+        self.ttl = ttl
+        self._sources = {}  # host or ip:port -> (etag, last_modified, digest, fetched)
+        self._hashes = {}  # payload sha256 -> {algorithm: hash}
+        self._addresses = {}  # hostname -> IP, resolved once per process
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.update(_sources={}, _hashes={}, _addresses={})
+        return state
+
+    def favicon_hashes(self, favicon_url, http_pool, hash_payload):
+        """Return {algorithm: hash} for the favicon at `favicon_url`, or None if there is none.
+
+        `hash_payload(content, digest)` computes the hashes of a payload this
+        cache has not seen before, given its raw SHA-256 digest.
+        """
+        parts = urlsplit(favicon_url)
+        host_key = f"{parts.scheme}://{parts.netloc}"
+        address = self._address(parts.hostname)
+        ip_key = f"{parts.scheme}://{address}:{parts.port or (443 if parts.scheme == 'https' else 80)}" if address else None
+
+        source = self._source(host_key)
+        if source and time.time() - source[3] < self.ttl:
+            return self._stored_hashes(source[2]) if source[2] else None
+
+        validators = source or (self._source(ip_key) if ip_key else None)
+        headers = {}
+        if validators and validators[2]:
+            if validators[0]:
+                headers["If-None-Match"] = validators[0]
+            if validators[1]:
+                headers["If-Modified-Since"] = validators[1]
+
+        response = http_pool.get(favicon_url, timeout=5, headers=headers)
+        if response.status_code == 304 and headers:
+            digest = validators[2]
+            etag, last_modified = validators[0], validators[1]
+            hashes = self._stored_hashes(digest)
+        elif response.status_code == 200 and 'image' in response.headers.get('Content-Type', ''):
+            raw_digest = hashlib.sha256(response.content).digest()
+            digest = raw_digest.hex()
+            etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+            hashes = self._stored_hashes(digest)
+            if hashes is None:
+                hashes = hash_payload(response.content, raw_digest)
+                self._store_hashes(digest, hashes)
+        else:
+            digest = etag = last_modified = hashes = None
+
+        record = (etag, last_modified, digest if hashes else None, time.time())
+        self._store_source(host_key, record)
+        if ip_key and hashes:
+            self._store_source(ip_key, record)
+        return hashes
+
+    def _address(self, hostname):
+        if not hostname:
+            return None
+        if hostname not in self._addresses:
+            try:
+                self._addresses[hostname] = socket.gethostbyname(hostname)
+            except OSError:
+                self._addresses[hostname] = None
+        return self._addresses[hostname]
+
+    def _source(self, key):
+        source = self._sources.get(key)
+        if source is None:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT etag, last_modified, digest, fetched FROM sources WHERE key = ?", (key,)
+                ).fetchone()
+            if row:
+                source = self._sources[key] = tuple(row)
+        return source
+
+    def _store_source(self, key, record):
+        self._sources[key] = record
+        with self._lock:
+            conn = self.conn
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sources (key, etag, last_modified, digest, fetched) VALUES (?, ?, ?, ?, ?)",
+                    (key, *record)
+                )
+
+    def _stored_hashes(self, digest):
+        hashes = self._hashes.get(digest)
+        if hashes is None:
+            with self._lock:
+                row = self.conn.execute("SELECT hashes FROM hashes WHERE digest = ?", (digest,)).fetchone()
+            if row:
+                hashes = self._hashes[digest] = json.loads(row[0])
+        return hashes
+
+    def _store_hashes(self, digest, hashes):
+        self._hashes[digest] = hashes
+        with self._lock:
+            conn = self.conn
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO hashes (digest, hashes) VALUES (?, ?)", (digest, json.dumps(hashes)))
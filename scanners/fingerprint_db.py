@@ -0,0 +1,175 @@
+# scanners/fingerprint_db.py
+import os
+import re
+import json
+import pickle
+import base64
+import hashlib
+from utils.color_print import ColorPrint
+from utils.atomic_file import atomic_write
+from scanners import fingerprint_matcher
+from scanners.fingerprint_matcher import FingerprintMatcher
+
+try:
+    import mmh3
+except ImportError:
+    mmh3 = None
+
+DEFAULT_FINGERPRINT_FILE = os.path.join(os.path.dirname(__file__), "data", "fingerprints.json")
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "fuzz_automation")
+
+# Loaded databases by data file path. Filled lazily; when the parent process
+# loads before forking its pool, workers share these pages copy-on-write.
+_loaded = {}
+_code_hash = None
+
+
+def _code_version():
+    """Hash of the modules whose objects are pickled into the cache, so editing them invalidates it."""
+    global _code_hash
+    if _code_hash is None:
+        digest = hashlib.sha256()
+        for module_file in (__file__, fingerprint_matcher.__file__):
+            with open(module_file, "rb") as f:
+                digest.update(f.read())
+        _code_hash = digest.hexdigest()[:16]
+    return _code_hash
+
+
+class FingerprintDatabase:
+    """Technology fingerprints and favicon hashes read from a data file.
+
+    Reads this repo's format or a Wappalyzer-style technologies.json; the
+    parsed index is pickled into `cache_dir` until the data file or the code changes.
+    """
+    favicon_algorithms = ("sha256", "sha256_b64", "mmh3")
+
+    def __init__(self, path=None, cache_dir=DEFAULT_CACHE_DIR):
+        self.path = os.path.abspath(path or DEFAULT_FINGERPRINT_FILE)
+        self.cache_dir = cache_dir
+
+    def __getstate__(self):
+        return {"path": self.path, "cache_dir": self.cache_dir}
+
+    @property
+    def matcher(self):
+        return self.load()["matcher"]
+
+    @property
+    def favicon_index(self):
+        """(algorithm, hash) -> technology, for O(1) favicon lookups."""
+        return self.load()["favicons"]
+
+    def load(self):
+        """Load (once per process tree) and return the indexed database."""
+        database = _loaded.get(self.path)
+        if database is None:
+            database = self._load_cached() or self._build()
+            _loaded[self.path] = database
+        return database
+
+    def lookup_favicon(self, content):
+        """Hash a favicon payload once per algorithm and return the matching technology."""
+        return self.match_favicon_hashes(self.favicon_hashes(content))
+
+    def match_favicon_hashes(self, hashes):
+        """Return the technology for already computed favicon_hashes(), if any."""
+        for algorithm, favicon_hash in hashes.items():
+            technology = self.favicon_index.get((algorithm, favicon_hash))
+            if technology:
+                return technology
+        return None
+
+    def favicon_hashes(self, content, digest=None):
+        """Every supported hash of a favicon payload, keyed by algorithm.
+
+        Pass the payload's raw SHA-256 `digest` if it is already known.
+        """
+        digest = digest or hashlib.sha256(content).digest()
+        hashes = {
+            "sha256": digest.hex(),
+            "sha256_b64": base64.b64encode(digest).decode("utf-8")
+        }
+        if mmh3 is not None:
+            # Shodan's http.favicon.hash: murmur3 of the newline-wrapped base64 body
+            hashes["mmh3"] = str(mmh3.hash(base64.encodebytes(content)))
+        return hashes
+
+    def _cache_file(self):
+        stat = os.stat(self.path)
+        key = hashlib.sha256(f"{self.path}:{stat.st_size}:{stat.st_mtime_ns}:{_code_version()}".encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"fingerprints_{key}.pickle")
+
+    def _load_cached(self):
+        try:
+            with open(self._cache_file(), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, AttributeError):
+            return None
+
+    def _build(self):
+        with open(self.path, "r") as f:
+            data = json.load(f)
+
+        technologies = data.get("technologies", data)
+        if any("patterns" in entry for entry in technologies.values()):
+            fingerprints = self._parse_native(technologies)
+        else:
+            fingerprints = self._parse_wappalyzer(technologies)
+
+        favicons = {}
+        for algorithm, hashes in data.get("favicons", {}).items():
+            for favicon_hash, technology in hashes.items():
+                favicons[(algorithm, str(favicon_hash))] = technology
+
+        database = {"matcher": FingerprintMatcher(fingerprints), "favicons": favicons}
+        self._store_cache(database)
+        ColorPrint.info(f"Indexed {len(fingerprints)} technology fingerprints from {self.path}")
+        return database
+
+    def _store_cache(self, database):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with atomic_write(self._cache_file(), "wb") as f:
+                pickle.dump(database, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            ColorPrint.warning(f"Could not cache fingerprint index: {e}")
+
+    def _parse_native(self, technologies):
+        fingerprints = {}
+        for name, entry in technologies.items():
+            patterns = []
+            for pattern in entry.get("patterns", []):
+                if isinstance(pattern, dict):
+                    flags = re.IGNORECASE if "i" in pattern.get("flags", "") else 0
+                    patterns.append((pattern["regex"], flags))
+                else:
+                    patterns.append((pattern, 0))
+            fingerprints[name] = self._valid_patterns(name, patterns)
+        return fingerprints
+
+    def _parse_wappalyzer(self, technologies):
+        fingerprints = {}
+        for name, entry in technologies.items():
+            sources = []
+            for key in ("html", "scriptSrc", "scripts", "text"):
+                value = entry.get(key, [])
+                sources.extend([value] if isinstance(value, str) else value)
+            for value in entry.get("meta", {}).values():
+                sources.extend([value] if isinstance(value, str) else value)
+
+            # Wappalyzer appends "\;version:\1\;confidence:50" style tags to its regexes
+            patterns = [(source.split("\\;")[0], re.IGNORECASE) for source in sources if source.split("\\;")[0]]
+            if patterns:
+                fingerprints[name] = self._valid_patterns(name, patterns)
+        return fingerprints
+
+    def _valid_patterns(self, name, patterns):
+        valid = []
+        for source, flags in patterns:
+            try:
+                re.compile(source, flags)
+                valid.append((source, flags))
+            except re.error:
+                ColorPrint.warning(f"Skipping invalid fingerprint for {name}: {source}")
+        return valid
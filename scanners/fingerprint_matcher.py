@@ -0,0 +1,118 @@
+# scanners/fingerprint_matcher.py
+import re
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class FingerprintMatcher:
+    """Reports every technology whose fingerprint matches a text.
+
+    Each regex is reduced to a literal anchor; one pass over the text finds
+    the anchors present, and only their patterns are run.
+    """
+    min_anchor_length = 3
+    automaton_threshold = 64  # Anchors needed before the automaton pays off
+
+    def __init__(self, fingerprints):
+        self.technologies = list(fingerprints)
+        self._patterns = []  # (technology index, source, flags)
+        self._compiled = {}  # pattern id -> compiled regex, filled on demand
+        self._anchors = {}  # anchor -> pattern ids, matched against the original text
+        self._folded_anchors = {}  # anchor -> pattern ids, matched against lowercased text
+        self._unanchored = []
+
+        for index, patterns in enumerate(fingerprints.values()):
+            for pattern in patterns:
+                if isinstance(pattern, str):
+                    source, flags = pattern, 0
+                elif isinstance(pattern, tuple):
+                    source, flags = pattern
+                else:
+                    source, flags = pattern.pattern, pattern.flags
+                pattern_id = len(self._patterns)
+                self._patterns.append((index, source, flags))
+
+                anchor, folded = self._extract_anchor(source, flags)
+                if anchor is None:
+                    self._unanchored.append(pattern_id)
+                elif folded:
+                    self._folded_anchors.setdefault(anchor.lower(), []).append(pattern_id)
+                else:
+                    self._anchors.setdefault(anchor, []).append(pattern_id)
+
+        self._automaton = self._build_automaton(self._anchors)
+        self._folded_automaton = self._build_automaton(self._folded_anchors)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_compiled"] = {}
+        return state
+
+    def _extract_anchor(self, source, flags):
+        """Return (the longest literal run present in every match or None, whether it is case-folded).
+
+        Folding follows the pattern's effective flags, so an inline (?i) counts as well.
+        """
+        try:
+            parsed = sre_parse.parse(source, flags)
+        except re.error:
+            return None, False
+
+        best, run = "", ""
+        for opcode, argument in parsed:
+            if opcode is sre_parse.LITERAL:
+                run += chr(argument)
+                continue
+            best = max(best, run, key=len)
+            run = ""
+        best = max(best, run, key=len)
+
+        folded = bool(parsed.state.flags & re.IGNORECASE)
+        return (best if len(best) >= self.min_anchor_length else None), folded
+
+    def _build_automaton(self, anchors):
+        if ahocorasick is None or len(anchors) < self.automaton_threshold:
+            return None
+        automaton = ahocorasick.Automaton()
+        for anchor, pattern_ids in anchors.items():
+            automaton.add_word(anchor, pattern_ids)
+        automaton.make_automaton()
+        return automaton
+
+    def _candidates(self, text, anchors, automaton):
+        if automaton is not None:
+            for _, pattern_ids in automaton.iter(text):
+                yield from pattern_ids
+        else:
+            for anchor, pattern_ids in anchors.items():
+                if anchor in text:
+                    yield from pattern_ids
+
+    def match(self, text):
+        """Return the matching technologies in fingerprint order."""
+        candidates = set(self._unanchored)
+        candidates.update(self._candidates(text, self._anchors, self._automaton))
+        if self._folded_anchors:
+            candidates.update(self._candidates(text.lower(), self._folded_anchors, self._folded_automaton))
+
+        found = set()
+        for pattern_id in candidates:
+            index = self._patterns[pattern_id][0]
+            if index not in found and self._compile(pattern_id).search(text):
+                found.add(index)
+        return [self.technologies[index] for index in sorted(found)]
+
+    def _compile(self, pattern_id):
+        compiled = self._compiled.get(pattern_id)
+        if compiled is None:
+            _, source, flags = self._patterns[pattern_id]
+            compiled = self._compiled[pattern_id] = re.compile(source, flags)
+        return compiled
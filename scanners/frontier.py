@@ -0,0 +1,111 @@
+# scanners/frontier.py
+import heapq
+import itertools
+from urllib.parse import urlsplit, urljoin
+
+
+class RecursionFrontier:
+    """Directories found while fuzzing a host, waiting to be fuzzed themselves.
+
+    Lives in the parent process and hands out one directory per host at a
+    time, shallowest and most promising first, within `request_budget`.
+    """
+    max_children = 25  # Directories one run may add, so a catch-all route cannot flood the frontier
+
+    def __init__(self, max_depth=0, request_budget=None):
+        self.max_depth = max_depth  # 0 disables recursion
+        self.request_budget = request_budget  # Requests per host across all its runs; None for no cap
+        self._hosts = {}  # host -> {"pending", "visited", "spent", "found", "status", "summaries"}
+        self._sequence = itertools.count()
+
+    def __getstate__(self):
+        # Workers only need the limits; the frontier itself stays in the parent
+        state = self.__dict__.copy()
+        state.update(_hosts={}, _sequence=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._sequence = itertools.count()
+
+    @property
+    def enabled(self):
+        return self.max_depth > 0
+
+    @staticmethod
+    def directory(item):
+        """The directory path ("/admin/") a hit points at, or None if it is not one.
+
+        A directory either redirects to its own path plus a slash on the same
+        host, or was requested with a trailing slash and answered.
+        """
+        url = item.get('url') or ''
+        status = item.get('status')
+        if not isinstance(status, int):
+            return None
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        location = item.get('redirectlocation')
+        if 300 <= status < 400 and location:
+            target = urlsplit(urljoin(url, location))
+            if target.path == path.rstrip('/') + '/' and (target.hostname or parts.hostname) == parts.hostname:
+                return target.path
+            return None
+        if path.endswith('/') and path != '/' and (200 <= status < 300 or status in (401, 403)):
+            return path
+        return None
+
+    def start(self, host):
+        self._hosts[host] = {"pending": [], "visited": {'/'}, "spent": 0, "found": 0, "status": None, "summaries": []}
+
+    def record(self, host, depth, outcome, directories, cost):
+        """Account for a finished run of `host` at `depth` and queue its new directories.
+
+        `outcome` is the run's (status, found, directories, dashboard summary).
+        """
+        state = self._hosts[host]
+        status, found, _, summary = outcome
+        state["spent"] += cost
+        state["found"] += found
+        if summary:
+            state["summaries"].append(summary)
+        if depth == 0:
+            state["status"] = status
+        elif status == 5 and state["status"] == 1:
+            state["status"] = 5  # A directory run that timed out leaves the host partial
+        if status not in (1, 5) or depth >= self.max_depth:
+            return
+
+        added = 0
+        for path, rank in sorted(directories.items(), key=lambda entry: entry[1]):
+            if path in state["visited"] or added >= self.max_children:
+                continue
+            state["visited"].add(path)
+            heapq.heappush(state["pending"], (depth + 1, rank, next(self._sequence), path))
+            added += 1
+
+    @staticmethod
+    def rank(status):
+        """Frontier order among directories of one depth: 2xx, then 401/403, then redirects."""
+        if 200 <= status < 300:
+            return 0
+        return 1 if status in (401, 403) else 2
+
+    def next(self, host, cost):
+        """Pop the next (path, depth) to fuzz for `host`, or None when it is done."""
+        state = self._hosts[host]
+        if not state["pending"]:
+            return None
+        if self.request_budget is not None and state["spent"] + cost > self.request_budget:
+            state["pending"] = []
+            return None
+        depth, _, _, path = heapq.heappop(state["pending"])
+        return path, depth
+
+    def finish(self, host):
+        """Forget `host` and return its (status, directories_found, summaries) over all runs.
+
+        `summaries` are the dashboard summaries of its runs, root run first.
+        """
+        state = self._hosts.pop(host)
+        return state["status"] or 3, state["found"], state["summaries"]
@@ -1,13 +1,35 @@
 # scanners/fuzzer.py
 import os
-import subprocess
+import asyncio
 import json
+import signal
+import tempfile
 from utils.color_print import ColorPrint
 import random
+from collections import deque
+from urllib.parse import urlsplit
+from utils.http_pool import HttpSessionPool
+from scanners.rate_controller import RateController
+from scanners.http_engine import AsyncHttpEngine
+from scanners.calibration import Calibrator
+from scanners.wordlist_store import WordlistStore
 
 class Fuzzer:
-    def __init__(self, output_dir="/home/kali/fuzz"):
+    # ffuf's default matchers plus the throttling statuses, which are watched but never reported
+    match_codes = "200-299,301,302,307,401,403,405,429,500,503"
+
+    def __init__(self, output_dir="/home/kali/fuzz", result_store=None, rate_controller=None, engine="ffuf",
+                 native_engine=None, wordlist_store=None):
         self.output_dir = output_dir
+        # "ffuf" shells out per host; "native" fuzzes in-process over pooled keep-alive connections
+        self.engine = engine
+        self.native_engine = native_engine or (AsyncHttpEngine() if engine == "native" else None)
+        self._status_ranges = [
+            tuple(int(bound) for bound in codes.split("-")) if "-" in codes else (int(codes), int(codes))
+            for codes in self.match_codes.split(",")
+        ]
+        self.result_store = result_store  # Every hit is also appended here when set
+        self.rate_controller = rate_controller or RateController()
         self.wordlists = {
             "php": "/root/wordlists/php/php.txt",
             "jsp": "/root/wordlists/jsp/jsp.txt",
@@ -19,6 +41,8 @@ class Fuzzer:
             # "python": "/home/kali/Desktop/wordlist/python/python.txt",
             "general": "/root/wordlists/dirsearch.txt",
         }
+        # Per-technology lists are compiled from these sources (see WordlistStore)
+        self.wordlist_store = wordlist_store or WordlistStore(self.wordlists)
         self.user_agents = [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36",
@@ -29,50 +53,384 @@ class Fuzzer:
             # Add more user agents as needed
         ]
 
-    def fuzz_subdomain(self, subdomain, technology):
+    def fuzz_subdomain(self, subdomain, technology, timeout=None, profile=None, word_limit=None):
         """Run FFUF on a subdomain with the appropriate wordlist and return results."""
-        wordlist = self._select_wordlist(technology)
-        domain = subdomain.split("//")[-1].split("/")[0]
-        sanitized_subdomain = domain.replace('.', '')
-        output_file = os.path.join(self.output_dir, f"{sanitized_subdomain}_ffuf.json")
-        user_agent = random.choice(self.user_agents)
+        return asyncio.run(self.fuzz_subdomain_async(subdomain, technology, timeout, profile, word_limit))
+
+    async def fuzz_subdomain_async(self, subdomain, technology, timeout=None, profile=None, word_limit=None):
+        """Collect a whole FFUF run into memory.
+
+        Returns {"results": [...], "timed_out": bool, "throttled": bool}, or None
+        if ffuf could not be run. Prefer stream_subdomain() for large hosts.
+        """
+        stream = self.stream_subdomain(subdomain, technology, timeout, profile, word_limit)
+        results = [item async for item in stream]
+        if stream.failed:
+            return None
+        return {"results": results, "timed_out": stream.timed_out, "throttled": stream.throttled}
+
+    def stream_subdomain(self, subdomain, technology, timeout=None, profile=None, word_limit=None):
+        """Return a FuzzStream that yields ffuf hits as ffuf reports them.
 
-        os.makedirs(self.output_dir, exist_ok=True)
+        `profile` is the host's HttpSessionPool.host_profile(), used to pick
+        ffuf's thread count and rate. `word_limit` stops after the first
+        entries of the wordlist (a fast pass); the rest is left for a later
+        run, which resumes from the checkpoint.
+        """
+        return FuzzStream(self, subdomain, technology, timeout, profile, word_limit)
 
-        ffuf_command = [
+    def _build_command(self, subdomain, technology, threads=5, rate=None, wordlist=None):
+        wordlist = wordlist or self._select_wordlist(technology)
+        user_agent = random.choice(self.user_agents)
+
+        return [
             "ffuf",
             "-u", f"{subdomain}/FUZZ",
             "-w", wordlist,
             "-ac",
-            "-o", output_file,
-            "-of", "json",
+            "-json",  # One JSON document per hit on stdout instead of a single file at exit
             "-H", f"User-Agent: {user_agent}",
-            "-t", "5"
+            "-mc", self.match_codes,
+            "-t", str(threads),
+            *(["-rate", str(rate)] if rate else [])
         ]
 
+    async def _kill_process_group(self, process, grace_period=5):
+        """Terminate ffuf and anything it spawned, escalating to SIGKILL."""
+        if process.returncode is not None:
+            return
         try:
-            subprocess.run(ffuf_command, text=True, check=True)
+            os.killpg(process.pid, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(process.wait(), grace_period)
+            except asyncio.TimeoutError:
+                os.killpg(process.pid, signal.SIGKILL)
+                await process.wait()
+        except ProcessLookupError:
+            pass  # Already gone
 
-            with open(output_file, 'r') as f:
-                results = json.load(f)
+    @property
+    def probe_engine(self):
+        """AsyncHttpEngine used for calibration probes (the native engine when there is one)."""
+        if self.native_engine is None:
+            self.native_engine = AsyncHttpEngine()
+        return self.native_engine
 
-            os.remove(output_file)
-            ColorPrint.success(f"Fuzzing complete for {subdomain}. Results saved.")
-            return results
-        except subprocess.CalledProcessError as e:
-            ColorPrint.error(f"Error fuzzing {subdomain}: FFUF exited with code {e.returncode}")
-            ColorPrint.error(f"FFUF Output:\n{e.stderr}")
-            return None
-        except FileNotFoundError:
-            ColorPrint.error(f"Error fuzzing {subdomain}: FFUF execution failed, is ffuf installed?")
-            return None
-        except json.JSONDecodeError:
-            ColorPrint.error(f"Error parsing FFUF output for {subdomain}.")
-            return None
-        except Exception as e:
-            ColorPrint.error(f"Error fuzzing {subdomain}: {e}")
+    def status_matches(self, status):
+        """Whether `status` is one ffuf would report under match_codes."""
+        return any(low <= status <= high for low, high in self._status_ranges)
+
+    def wordlist_size(self, technology):
+        """Number of entries in the compiled wordlist used for `technology`."""
+        try:
+            return len(self.compiled_wordlist(technology))
+        except OSError:
+            return 0  # The fuzz run reports the missing wordlist
+
+    def wordlist_signature(self, wordlist):
+        """Identifies a wordlist version, so checkpoints taken on an edited list are not reused."""
+        try:
+            stat = os.stat(wordlist)
+        except OSError:
+            return wordlist
+        return f"{wordlist}:{stat.st_size}:{int(stat.st_mtime)}"
+
+    def checkpointed_wordlist(self, signature):
+        """The compiled wordlist a checkpoint was taken on, or None if it was removed or changed.
+
+        A ranked list is named after its ranking, which moves as hit history
+        grows, so a resumed run keeps the exact list its checkpoint counts.
+        """
+        path = signature.rsplit(":", 2)[0]
+        if self.wordlist_signature(path) != signature:
             return None
+        return self.wordlist_store.load(path)
+
+    def rank_wordlists(self, max_paths=2000):
+        """Order every technology's wordlist by the hits its entries had on earlier hosts.
+
+        Technologies without history of their own use the ranking across all
+        technologies. Call before the pool starts, so workers inherit it.
+        """
+        if self.result_store is None:
+            return
+        hosts = self.result_store.stat_hosts()
+        if not hosts:
+            return
+        for technology in (*hosts, None):
+            words = [word for word, _ in self.result_store.top_paths(technology, max_paths)]
+            if words:
+                self.wordlist_store.rank(technology, words)
+        ColorPrint.info(f"Wordlists ordered by the hits of {sum(hosts.values())} earlier hosts.")
+
+    def compiled_wordlist(self, technology):
+        """The deduplicated, indexed wordlist for a technology (a CompiledWordlist)."""
+        return self.wordlist_store.get(technology)
 
     def _select_wordlist(self, technology):
-        """Select the appropriate wordlist based on the technology."""
-        return self.wordlists.get(technology, self.wordlists["general"])
\ No newline at end of file
+        """Select the appropriate wordlist file based on the technology."""
+        return self.compiled_wordlist(technology).path
+
+
+class FuzzStream:
+    """Async iterator over the hits of a host's fuzz run.
+
+    Stops at `timeout`, restarts slower when the host throttles, and with a
+    result store checkpoints each shard so a later run resumes where it
+    stopped. `timed_out`, `throttled` (gave up after `max_restarts`),
+    `failed`, `count` and `restarts` describe the run.
+    """
+    store_batch_size = 500
+    shard_size = 2000
+    throttle_window = 50
+    throttle_limit = 10
+
+    def __init__(self, fuzzer, subdomain, technology, timeout=None, profile=None, word_limit=None):
+        self.fuzzer = fuzzer
+        self.subdomain = subdomain
+        self.technology = technology
+        self.timeout = timeout
+        self.profile = profile
+        self.word_limit = word_limit
+        self.timed_out = False
+        self.throttled = False
+        self.failed = False
+        self.count = 0
+        self.restarts = 0
+        self._unstored = []
+        self._seen = set()  # URLs already yielded, so a restarted run does not repeat them
+        self.calibrator = None
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout if self.timeout else None
+        controller = self.fuzzer.rate_controller
+        settings = controller.plan(self.profile)
+
+        store = self.fuzzer.result_store
+        try:
+            wordlist = self.fuzzer.compiled_wordlist(self.technology)
+        except OSError as e:
+            self.failed = True
+            ColorPrint.error(f"Error fuzzing {self.subdomain}: cannot build its wordlist: {e}")
+            return
+        signature = self.fuzzer.wordlist_signature(wordlist.path)
+        offset = 0
+        if store is not None:
+            recorded, offset = store.checkpoint(self.subdomain)
+            resumed = self.fuzzer.checkpointed_wordlist(recorded) if recorded else None
+            if resumed is not None:
+                # The checkpointed list wins over a newer ranking of the technology's list until the run completes
+                wordlist, signature = resumed, recorded
+                ColorPrint.info(f"Resuming {self.subdomain} at word {offset} of {wordlist.path}.")
+                for item in store.findings(self.subdomain):
+                    self._seen.add(item['url'])
+                    self.count += 1
+                    yield item
+            else:
+                offset = 0
+                store.clear_host(self.subdomain)
+
+        end = min(self.word_limit, len(wordlist)) if self.word_limit else len(wordlist)
+        completed = offset  # Words before this one are fully fuzzed
+        try:
+            self.calibrator = await self._calibrate(deadline)
+            for shard, shard_end in self._shards(wordlist, offset, end, sharded=store is not None or end < len(wordlist)):
+                try:
+                    while True:
+                        granted = await self._acquire_rate(controller, settings["rate"], deadline)
+                        run = self._run_once(settings["threads"], granted, deadline, shard)
+                        try:
+                            throttled = False
+                            async for item in run:
+                                if item is None:
+                                    throttled = True
+                                    break
+                                yield item
+                        finally:
+                            await run.aclose()  # Kills ffuf now rather than when the generator is collected
+                            controller.release(granted)
+
+                        if not throttled or self.failed or self.restarts >= controller.max_restarts:
+                            break
+                        self.restarts += 1
+                        settings = controller.back_off(settings)
+                        ColorPrint.warning(
+                            f"{self.subdomain} is throttling; restarting with {settings['threads']} threads "
+                            f"at {settings['rate']} req/s (restart {self.restarts})."
+                        )
+                finally:
+                    if shard != wordlist.path:
+                        os.remove(shard)
+
+                if self.failed:
+                    return
+                if throttled:
+                    self.throttled = True
+                    self._save_progress(signature, completed)
+                    ColorPrint.warning(f"{self.subdomain} keeps throttling; keeping {self.count} results.")
+                    return
+                completed = shard_end
+                self._save_progress(signature, completed)
+
+            if store is not None and end == len(wordlist):
+                store.clear_checkpoint(self.subdomain)
+                self._record_path_hits()
+        except asyncio.TimeoutError:
+            self.timed_out = True
+            self._save_progress(signature, completed)
+            ColorPrint.warning(f"Fuzzing for {self.subdomain} hit its {self.timeout}s budget; keeping {self.count} partial results.")
+            return
+        except OSError as e:
+            self.failed = True
+            ColorPrint.error(f"Error fuzzing {self.subdomain}: cannot read wordlist {wordlist.path}: {e}")
+            return
+        finally:
+            self._store_hits()
+
+        if self.calibrator.dropped:
+            ColorPrint.info(f"Dropped {self.calibrator.dropped} soft-404 responses for {self.subdomain}.")
+        ColorPrint.success(f"Fuzzing complete for {self.subdomain}. {self.count} results streamed.")
+
+    def _save_progress(self, signature, completed):
+        """Checkpoint the words fully fuzzed so far, even none, so a later run resumes this list."""
+        store = self.fuzzer.result_store
+        if store is not None:
+            # Findings first, so a checkpoint never points past unsaved hits
+            self._store_hits()
+            store.save_checkpoint(self.subdomain, signature, completed)
+
+    async def _calibrate(self, deadline):
+        loop = asyncio.get_running_loop()
+        headers = {"User-Agent": random.choice(self.fuzzer.user_agents)}
+        calibrator = Calibrator()
+        remaining = deadline - loop.time() if deadline else None
+        await asyncio.wait_for(calibrator.calibrate(self.fuzzer.probe_engine, self.subdomain, headers), remaining)
+        return calibrator
+
+    def _shards(self, wordlist, offset, end, sharded):
+        """Yield (wordlist file, offset after it) for every shard from `offset` up to `end`.
+
+        `wordlist` is a CompiledWordlist, so a shard is one slice of its
+        mapped file, wherever it starts. Unsharded runs get the whole
+        compiled file as a single shard.
+        """
+        if not sharded:
+            yield wordlist.path, None
+            return
+        for start in range(offset, end, self.shard_size):
+            shard_end = min(start + self.shard_size, end)
+            with tempfile.NamedTemporaryFile("wb", prefix="ffuf_shard_", suffix=".txt", delete=False) as shard:
+                shard.write(wordlist.slice_bytes(start, shard_end))
+            yield shard.name, shard_end
+
+    async def _acquire_rate(self, controller, rate, deadline):
+        """Wait until the shared budget grants this run a request rate."""
+        if rate is None:
+            return None  # Not rate limited, so there is nothing to reserve
+        loop = asyncio.get_running_loop()
+        while True:
+            granted = controller.try_acquire(rate)
+            if granted:
+                return granted
+            if deadline and loop.time() >= deadline:
+                raise asyncio.TimeoutError
+            await asyncio.sleep(1)
+
+    async def _run_once(self, threads, rate, deadline, wordlist=None):
+        """Yield the new hits of one engine run, then None if the host began throttling."""
+        loop = asyncio.get_running_loop()
+        wordlist = wordlist or self.fuzzer._select_wordlist(self.technology)
+        if self.fuzzer.engine == "native":
+            source = self.fuzzer.native_engine.fuzz(
+                self.subdomain, wordlist, threads, rate,
+                match=self.fuzzer.status_matches, user_agent=random.choice(self.fuzzer.user_agents),
+                calibrator=self.calibrator
+            )
+        else:
+            source = self._ffuf_hits(threads, rate, wordlist)
+
+        recent = deque(maxlen=self.throttle_window)  # Whether each recent response was a throttle
+        try:
+            while True:
+                remaining = deadline - loop.time() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError
+                try:
+                    item = await asyncio.wait_for(source.__anext__(), remaining)
+                except StopAsyncIteration:
+                    break
+
+                throttle = item.get('status') in HttpSessionPool.throttle_statuses
+                recent.append(throttle)
+                if throttle:
+                    if sum(recent) >= self.throttle_limit:
+                        yield None
+                        return
+                    continue
+                if item.get('url') in self._seen:
+                    continue
+                if self.fuzzer.engine != "native" and await self.calibrator.is_noise(item):
+                    continue  # The native engine already checked it, with the body
+                self._seen.add(item.get('url'))
+                self.count += 1
+                if self.fuzzer.result_store is not None:
+                    self._unstored.append(item)
+                    if len(self._unstored) >= self.store_batch_size:
+                        self._store_hits()
+                yield item
+        except asyncio.TimeoutError:
+            raise  # Handled by _iterate
+        except Exception as e:
+            self.failed = True
+            ColorPrint.error(f"Error fuzzing {self.subdomain}: {e}")
+        finally:
+            # Also runs when the consumer stops iterating early
+            await source.aclose()
+
+    async def _ffuf_hits(self, threads, rate, wordlist):
+        """Yield every JSON hit of one ffuf process; sets `failed` if ffuf cannot run or exits non-zero."""
+        try:
+            # A new session gives ffuf its own process group so the whole tree can be killed
+            process = await asyncio.create_subprocess_exec(
+                *self.fuzzer._build_command(self.subdomain, self.technology, threads, rate, wordlist),
+                stdout=asyncio.subprocess.PIPE,
+                start_new_session=True
+            )
+        except FileNotFoundError:
+            ColorPrint.error(f"Error fuzzing {self.subdomain}: FFUF execution failed, is ffuf installed?")
+            self.failed = True
+            return
+
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Skip any non-JSON noise ffuf prints
+            returncode = await process.wait()
+        finally:
+            await self.fuzzer._kill_process_group(process)
+
+        if returncode != 0:
+            self.failed = True
+            ColorPrint.error(f"Error fuzzing {self.subdomain}: FFUF exited with code {returncode}")
+
+    def _record_path_hits(self):
+        """Count the wordlist entries this host answered; directory runs are not counted."""
+        base = self.subdomain.rstrip('/')
+        if urlsplit(base).path:
+            return
+        words = [url[len(base) + 1:] for url in self._seen if url and url.startswith(base + '/')]
+        self.fuzzer.result_store.record_path_hits(self.subdomain, self.technology, words)
+
+    def _store_hits(self):
+        if self._unstored:
+            self.fuzzer.result_store.add_many(self.subdomain, self._unstored)
+            self._unstored = []
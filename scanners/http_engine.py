@@ -0,0 +1,257 @@
+# scanners/http_engine.py
+import ssl
+import time
+import asyncio
+from collections import deque
+from urllib.parse import urlsplit, quote
+from scanners.calibration import Calibrator
+
+# Characters sent as-is in a request target; everything else (spaces, CR/LF, non-ASCII) is percent-encoded
+_TARGET_SAFE = "/?&=%#;:@!$'()*+,~.-_[]"
+
+
+class HttpResponse:
+    __slots__ = ("status", "headers", "body", "length", "duration")
+
+    def __init__(self, status, headers, body, length, duration):
+        self.status = status
+        self.headers = headers  # Lowercased names
+        self.body = body  # At most max_body bytes
+        self.length = length  # Full body size in bytes
+        self.duration = duration  # Nanoseconds, as ffuf reports it
+
+
+class AsyncHttpEngine:
+    """In-process fuzzing engine speaking HTTP/1.1 over asyncio streams.
+
+    Keep-alive connections are pooled per host; `fuzz()` yields the same
+    result dicts as ffuf -json. Redirects are not followed.
+    """
+    max_body = 5 * 1024 * 1024  # Bytes of a body kept for word/line counts; the rest is only counted
+
+    def __init__(self, max_concurrency=200, timeout=10, user_agent=None):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.user_agent = user_agent or "Mozilla/5.0"
+        self._loop = None
+        self._idle = {}  # (scheme, host, port) -> idle (reader, writer) pairs
+        self._semaphore = None
+        self._ssl_context = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(_loop=None, _idle={}, _semaphore=None, _ssl_context=None)
+        return state
+
+    def _bind_loop(self):
+        """Pools and semaphores belong to one event loop; start fresh under a new one."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._idle = {}
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self._ssl_context is None:
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+
+    async def fuzz(self, base_url, wordlist, threads=5, rate=None, match=None, user_agent=None, calibrator=None):
+        """Yield a result dict for every word whose response passes `match(status)`.
+
+        Responses the calibrator flags as soft-404s are dropped; without one,
+        the host is calibrated first.
+        """
+        self._bind_loop()
+        base_url = base_url.rstrip("/")
+        headers = {"User-Agent": user_agent or self.user_agent}
+        if calibrator is None:
+            calibrator = await Calibrator().calibrate(self, base_url, headers)
+        results = asyncio.Queue(maxsize=threads * 4)
+        pacer = _Pacer(rate)
+        done = object()
+
+        with open(wordlist, "r", encoding="utf-8", errors="ignore") as words:
+            entries = enumerate((line.rstrip("\r\n") for line in words), 1)
+
+            async def worker():
+                for position, word in entries:
+                    if not word:
+                        continue
+                    await pacer.wait()
+                    url = f"{base_url}/{word}"
+                    try:
+                        response = await self.request("GET", url, headers)
+                    except (OSError, asyncio.TimeoutError, ValueError):
+                        continue  # Unreachable words are skipped, as in ffuf
+                    if match and not match(response.status):
+                        continue
+                    result = self._result(word, position, url, response)
+                    if await calibrator.is_noise(result, response.body):
+                        continue
+                    await results.put(result)
+
+            async def close_when_done():
+                await asyncio.gather(*tasks, return_exceptions=True)
+                await results.put(done)
+
+            tasks = [asyncio.create_task(worker()) for _ in range(max(1, threads))]
+            closer = asyncio.create_task(close_when_done())
+            try:
+                while True:
+                    item = await results.get()
+                    if item is done:
+                        break
+                    yield item
+            finally:
+                for task in (*tasks, closer):
+                    task.cancel()
+                await asyncio.gather(*tasks, closer, return_exceptions=True)
+
+    def _result(self, word, position, url, response):
+        body = response.body
+        return {
+            "input": {"FUZZ": word},
+            "position": position,
+            "status": response.status,
+            "length": response.length,
+            "words": len(body.split(b" ")),
+            "lines": len(body.split(b"\n")),
+            "content-type": response.headers.get("content-type", ""),
+            "redirectlocation": response.headers.get("location", ""),
+            "url": url,
+            "duration": response.duration,
+            "host": urlsplit(url).netloc
+        }
+
+    async def request(self, method, url, headers=None):
+        """Send one request over a pooled keep-alive connection and return an HttpResponse."""
+        self._bind_loop()
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        target = quote(parts.path or "/", safe=_TARGET_SAFE) + (f"?{quote(parts.query, safe=_TARGET_SAFE)}" if parts.query else "")
+        host_header = parts.hostname if port in (80, 443) else f"{parts.hostname}:{port}"
+
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host_header}", "Accept: */*", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1", errors="replace")
+
+        async with self._semaphore:
+            started = time.perf_counter_ns()
+            for attempt in (1, 2):
+                reader, writer, reused = await self._connect(key)
+                try:
+                    writer.write(payload)
+                    await writer.drain()
+                    status, response_headers, body, length, keep_alive = await asyncio.wait_for(
+                        self._read_response(reader, method), self.timeout
+                    )
+                except asyncio.TimeoutError:
+                    # Caught first: TimeoutError is an OSError on 3.11+, and a slow response is not retried
+                    writer.close()
+                    raise
+                except (OSError, asyncio.IncompleteReadError, ConnectionError) as e:
+                    writer.close()
+                    # A pooled connection the server already closed; retry once on a fresh one
+                    if reused and attempt == 1:
+                        continue
+                    raise ConnectionError(str(e)) from e
+                except BaseException:
+                    writer.close()
+                    raise
+                if keep_alive:
+                    self._idle.setdefault(key, deque()).append((reader, writer))
+                else:
+                    writer.close()
+                return HttpResponse(status, response_headers, body, length, time.perf_counter_ns() - started)
+
+    async def _connect(self, key):
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        scheme, host, port = key
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self._ssl_context if scheme == "https" else None,
+                                    server_hostname=host if scheme == "https" else None),
+            self.timeout
+        )
+        return reader, writer, False
+
+    async def _read_response(self, reader, method):
+        """Parse one response; returns (status, headers, body, length, keep_alive)."""
+        while True:
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError("Connection closed before a response")
+            version, status = status_line.decode("latin-1").split(" ", 2)[:2]
+            status = int(status)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if status >= 200 or status == 101:
+                break  # Skip interim 1xx responses
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return status, headers, b"", 0, keep_alive
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            body, length = bytearray(), 0
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # Trailers
+                    break
+                chunk = await reader.readexactly(size)
+                await reader.readexactly(2)
+                length += size
+                if len(body) < self.max_body:
+                    body += chunk[:self.max_body - len(body)]
+            return status, headers, bytes(body), length, keep_alive
+        if "content-length" in headers:
+            length = int(headers["content-length"])
+            body = await reader.readexactly(min(length, self.max_body))
+            remaining = length - len(body)
+            while remaining > 0:
+                remaining -= len(await reader.readexactly(min(remaining, 65536)))
+            return status, headers, body, length, keep_alive
+        # No framing: the body runs until the server closes the connection
+        body, length = bytearray(), 0
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+            length += len(chunk)
+            if len(body) < self.max_body:
+                body += chunk[:self.max_body - len(body)]
+        return status, headers, bytes(body), length, False
+
+
+class _Pacer:
+    """Spaces requests `1 / rate` seconds apart across all workers of one run."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self._next = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
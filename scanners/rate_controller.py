@@ -0,0 +1,74 @@
+# scanners/rate_controller.py
+import multiprocessing
+
+# Shared request-rate budget, created by the parent before it forks its pool so
+# every worker inherits the same counters (they cannot be pickled to workers)
+_shared_budget = None
+
+
+class RateController:
+    """Chooses ffuf's thread count and request rate for each host.
+
+    Sized from the host's detection profile; a -rate is only set after the
+    host throttled or under `global_rate`, a budget shared by all workers.
+    """
+    # (median latency upper bound in seconds, threads, requests per second once a rate applies)
+    latency_tiers = ((0.3, 25, 150), (1.0, 10, 60), (None, 4, 20))
+    default_tier = (5, 50)  # No measurements for the host; ffuf's usual thread count
+
+    def __init__(self, global_rate=None, min_threads=2, min_rate=10, max_error_rate=0.2, max_restarts=3):
+        self.global_rate = global_rate
+        self.min_threads = min_threads
+        self.min_rate = min_rate
+        self.max_error_rate = max_error_rate
+        self.max_restarts = max_restarts  # Throttled restarts per host before keeping what was found
+
+    def plan(self, profile=None):
+        """Return {"threads", "rate", "fallback_rate"} for a host with the given HttpSessionPool.host_profile().
+
+        "rate" is None (no -rate) unless the host already throttled or a
+        global cap applies; "fallback_rate" is where back_off() starts.
+        """
+        if not profile or profile.get("latency") is None:
+            threads, rate = self.default_tier
+        elif profile["throttled"] or profile["error_rate"] > self.max_error_rate:
+            return {"threads": self.min_threads, "rate": self.min_rate, "fallback_rate": self.min_rate}
+        else:
+            threads, rate = next(
+                (threads, rate) for max_latency, threads, rate in self.latency_tiers
+                if max_latency is None or profile["latency"] <= max_latency
+            )
+        return {"threads": threads, "rate": rate if self.global_rate else None, "fallback_rate": rate}
+
+    def back_off(self, settings):
+        """Halve threads and rate after the host started throttling us."""
+        rate = max(self.min_rate, (settings["rate"] or settings["fallback_rate"]) // 2)
+        return {"threads": max(self.min_threads, settings["threads"] // 2), "rate": rate, "fallback_rate": rate}
+
+    def share_budget(self):
+        """Create the cross-process rate budget; call in the parent before starting the pool."""
+        global _shared_budget
+        if self.global_rate and _shared_budget is None:
+            _shared_budget = multiprocessing.Value('i', 0)  # Requests per second currently reserved
+
+    def try_acquire(self, rate):
+        """Reserve up to `rate` requests per second; returns the granted rate, or 0 to retry later.
+
+        Without a global cap the full rate is granted (None for a run with no -rate). A partial grant is
+        made once at least `min_rate` is free, so a busy box slows new runs
+        down rather than starving them.
+        """
+        if not self.global_rate or _shared_budget is None:
+            return rate
+        with _shared_budget.get_lock():
+            available = self.global_rate - _shared_budget.value
+            granted = min(rate, available)
+            if granted < min(rate, self.min_rate):
+                return 0
+            _shared_budget.value += granted
+            return granted
+
+    def release(self, granted):
+        if self.global_rate and _shared_budget is not None and granted:
+            with _shared_budget.get_lock():
+                _shared_budget.value -= granted
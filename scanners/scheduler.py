@@ -0,0 +1,87 @@
+# scanners/scheduler.py
+import os
+import heapq
+import itertools
+import resource
+
+class FuzzScheduler:
+    """Decides which detected host gets the next ffuf run, and when.
+
+    Hosts are ordered by expected findings per wordlist line, within a cap
+    on running fuzzers and open sockets that follows the load average.
+    """
+    load_high = 0.9  # Load per core above which fewer ffuf processes run
+    load_low = 0.6  # Load per core below which more may start
+    depth_decay = 0.5  # Priority factor per recursion level
+
+    def __init__(self, max_fuzzers, max_inflight_requests=None, yield_prior=5.0, prior_weight=3):
+        self.cpus = os.cpu_count() or 1
+        self.max_fuzzers = max_fuzzers
+        self.max_inflight_requests = max_inflight_requests or self.socket_budget()
+        self.fuzzer_limit = max(1, min(max_fuzzers, self.cpus))
+        self.yield_prior = yield_prior
+        self.prior_weight = prior_weight  # How many hosts the prior counts for
+        self._ready = []  # (-priority, sequence, host, job, threads)
+        self._sequence = itertools.count()
+        self._running = {}  # host -> threads
+        self._yields = {}  # technology -> [findings, hosts]
+
+    @staticmethod
+    def socket_budget():
+        """Half the open-file limit, leaving the rest for pipes, databases and caches."""
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft == resource.RLIM_INFINITY:
+            return 4096
+        return max(16, soft // 2)
+
+    @property
+    def queued(self):
+        return len(self._ready)
+
+    @property
+    def running(self):
+        return len(self._running)
+
+    @property
+    def inflight_requests(self):
+        return sum(self._running.values())
+
+    def expected_yield(self, technology):
+        findings, hosts = self._yields.get(technology, (0, 0))
+        return (findings + self.yield_prior * self.prior_weight) / (hosts + self.prior_weight)
+
+    def push(self, host, job, threads, technology, wordlist_lines, depth=0):
+        """Queue a detected host; `job` is handed back by next_job() when it may start."""
+        priority = self.expected_yield(technology) / max(wordlist_lines, 1) * self.depth_decay ** depth
+        heapq.heappush(self._ready, (-priority, next(self._sequence), host, job, threads))
+
+    def next_job(self):
+        """Pop the best queued (host, job) that fits the budgets, or None."""
+        if not self._ready or self.running >= self.fuzzer_limit:
+            return None
+        _, _, host, job, threads = self._ready[0]
+        # An idle box always takes a host, however many threads it wants
+        if self._running and self.inflight_requests + threads > self.max_inflight_requests:
+            return None
+        heapq.heappop(self._ready)
+        self._running[host] = threads
+        return host, job
+
+    def finish(self, host, technology=None, findings=None):
+        """Free a host's budget and learn from its yield."""
+        self._running.pop(host, None)
+        if findings is not None:
+            totals = self._yields.setdefault(technology, [0, 0])
+            totals[0] += findings
+            totals[1] += 1
+
+    def adjust_for_load(self):
+        """Raise or lower fuzzer_limit by one according to the 1-minute load average."""
+        try:
+            load = os.getloadavg()[0] / self.cpus
+        except OSError:
+            return
+        if load > self.load_high and self.fuzzer_limit > 1:
+            self.fuzzer_limit -= 1
+        elif load < self.load_low and self.fuzzer_limit < self.max_fuzzers and self.running >= self.fuzzer_limit:
+            self.fuzzer_limit += 1
@@ -1,13 +1,28 @@
+import os
+import time
+import signal
+import threading
 import subprocess
 import requests
 from bs4 import BeautifulSoup, Comment
 import re
-from utils.color_print import ColorPrint
 import hashlib
-import base64
+from utils.color_print import ColorPrint
+from utils.http_pool import HttpSessionPool
+from scanners.fingerprint_db import FingerprintDatabase
+from scanners.detection_cache import DetectionCache
+from scanners.favicon_cache import FaviconCache
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 
 class TechnologyDetector:
-    def __init__(self):
+    external_probes = ("WhatWeb", "Wappalyzer")
+
+    def __init__(self, probe_timeouts=None, http_pool=None, fingerprint_db=None, detection_cache=None,
+                 favicon_cache=None):
+        self.http_pool = http_pool or HttpSessionPool()
+        # Per-probe budgets in seconds; the probes run concurrently
+        self.probe_timeouts = {"WhatWeb": 60, "Wappalyzer": 60, "SecurityScan": 45}
+        self.probe_timeouts.update(probe_timeouts or {})
         self.important_security_headers = [
             'X-Frame-Options',
             'X-Content-Type-Options',
@@ -16,139 +31,175 @@ class TechnologyDetector:
             'Strict-Transport-Security',
             'Referrer-Policy'
         ]
-        self.tech_fingerprints = {
-            "WordPress": [
-                re.compile(r'wp-content'),
-                re.compile(r'wp-admin'),
-                re.compile(r'WordPress')
-            ],
-            "Joomla": [
-                re.compile(r'index.php\?option=com_'),
-                re.compile(r'Joomla!')
-            ],
-            "Drupal": [
-                re.compile(r'Drupal'),
-                re.compile(r'Powered by Drupal')
-            ],
-            "Magento": [
-                re.compile(r'skin/frontend/'),
-                re.compile(r'Magento')
-            ],
-            "PHPMyAdmin": [
-                re.compile(r'phpMyAdmin')
-            ],
-            "Apache": [
-                re.compile(r'Apache')
-            ],
-            "Nginx": [
-                re.compile(r'nginx')
-            ],
-            "IIS": [
-                re.compile(r'Microsoft-IIS')
-            ],
-            "React": [
-                re.compile(r'_reactRoot'),
-                re.compile(r'createElement'),
-                re.compile(r'react-dom\.production\.min\.js'), # Common React library file
-            ],
-            "Vue.js": [
-                re.compile(r'new Vue'),
-                re.compile(r'vue\.runtime\.esm\.js') # Common Vue library file
-            ],
-            "Angular": [
-                re.compile(r'ng-version'),
-                re.compile(r'angular\.js') # Common Angular library file
-            ],
-            "Node.js": [
-                re.compile(r'X-Powered-By.*Node\.js', re.IGNORECASE)
-            ],
-            "ASP.NET": [
-                re.compile(r'ASP.NET'),
-                re.compile(r'__VIEWSTATE')
-            ],
-            "Ruby on Rails": [
-                re.compile(r'action_controller\.params'),
-                re.compile(r'railties')
-            ],
-            "PHP": [
-                re.compile(r'PHP/\d+\.\d+\.\d+')
-            ],
-            "Next.js": [
-                re.compile(r'/_next/static/'),
-                re.compile(r'data-precedence="next"'),
-                re.compile(r'__next_f=')
-            ],
-            "Styled Components": [
-                re.compile(r'data-styled="true"'),
-                re.compile(r'data-styled-version="[\d\.]+"')
-            ],
-            "Stripe": [
-                re.compile(r'https://js\.stripe\.com/v\d+/'),
-                re.compile(r'stripe\.confirmCardPayment')
-            ],
-            "JQuery": [
-                re.compile(r'jquery-[\d\.]+\.min\.js')
-            ],
-            "Bootstrap": [
-                re.compile(r'bootstrap\.min\.css'),
-                re.compile(r'bootstrap\.bundle\.min\.js')
-            ],
-            "Font Awesome": [
-                re.compile(r'fontawesome-free/\w+\.css'),
-                re.compile(r'fa-')
-            ]
-            # Add more fingerprints here
-        }
-        self.favicon_hashes = {
-            # WordPress
-            "S4mrNEqmBPjL4UeBPixCVA==": "WordPress",
-            "S4mrNEqmBPjL4UeBPixCVA=": "WordPress", # Handle potential padding differences
-
-            # React (Create React App default)
-            "koDiTOrf19VUmN01uHMedw==": "React",
-            "koDiTOrf19VUmN01uHMedw=": "React", # Handle potential padding differences
-
-            # Next.js (Vercel's default)
-            "sA3SxlmYrk6ykvjSZpdPHA==": "Next.js",
-            "sA3SxlmYrk6ykvjSZpdPHA=": "Next.js", # Handle potential padding differences
-
-            # Example for another common technology - PHP
-            "2n1QSm5VFQ6g5rwlhU3CuQ==": "PHP",
-            "2n1QSm5VFQ6g5rwlhU3CuQ=": "PHP", # Handle potential padding differences
-
-            # Add more favicon hashes and their corresponding technologies (use SHA-256 base64 encoded)
-        }
+        # Fingerprints and favicon hashes live in scanners/data/fingerprints.json
+        self.fingerprint_db = fingerprint_db or FingerprintDatabase()
+        # Earlier results per host and landing-page hash; pass False to always probe
+        self.detection_cache = DetectionCache() if detection_cache is None else detection_cache
+        # Favicon validators and hashes shared by hosts on the same frontend; False always downloads
+        self.favicon_cache = FaviconCache() if favicon_cache is None else favicon_cache
+
+    @property
+    def fingerprint_matcher(self):
+        """Anchor-indexed matcher over every fingerprint, loaded on first use."""
+        return self.fingerprint_db.matcher
 
     def detect_technology(self, subdomain):
         """Detect the technology stack of a subdomain using multiple tools."""
         try:
-            tech_details = {}
-            tech_details["WhatWeb"] = self._run_whatweb(subdomain)
-            tech_details["Wappalyzer"] = self._run_wappalyzer(subdomain)
-            tech_details["SecurityScan"] = self._active_scan(subdomain)
-
-            return self._determine_primary_technology(tech_details), tech_details
+            if not self.detection_cache:
+                tech_details = self._run_probes(subdomain, {
+                    "WhatWeb": self._run_whatweb,
+                    "Wappalyzer": self._run_wappalyzer,
+                    "SecurityScan": self._active_scan
+                })
+                return self._determine_primary_technology(tech_details), tech_details
+            return self._detect_with_cache(subdomain)
 
         except Exception as e:
             ColorPrint.error(f"Error detecting technology for {subdomain}: {str(e)}")
             return "general", {"Error": str(e)}
 
-    def _run_whatweb(self, subdomain):
+    def _detect_with_cache(self, subdomain):
+        """Serve fresh results from the cache and only wait for the external tools on changed pages.
+
+        All three probes start together. Once the active scan has hashed the
+        landing page, an expired entry for the host, or another host serving
+        the same page and favicon, can stand in for WhatWeb/Wappalyzer; the
+        tools are then stopped. A cache hit also restores the host profile
+        measured when the entry was made, for sizing the fuzz run.
+        """
+        cache = self.detection_cache
+        cached = cache.get(subdomain)
+        if cached and cached[2]:
+            cache.record("hits")
+            ColorPrint.info(f"Using cached technology detection for {subdomain}.")
+            self.http_pool.seed_profile(subdomain, cached[4])
+            return cached[0], cached[1]
+
+        page_hashes = {}
+        stop_tools = threading.Event()
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=3)
+        futures = {
+            "SecurityScan": executor.submit(self._active_scan, subdomain, page_hashes),
+            "WhatWeb": executor.submit(self._run_whatweb, subdomain, stop_tools),
+            "Wappalyzer": executor.submit(self._run_wappalyzer, subdomain, stop_tools)
+        }
         try:
-            result = subprocess.run(["whatweb", subdomain], capture_output=True, text=True)
-            return result.stdout
-        except subprocess.SubprocessError as e:
-            return f"WhatWeb error: {str(e)}"
-
-    def _run_wappalyzer(self, subdomain):
+            security_info = self._probe_result(subdomain, "SecurityScan", futures["SecurityScan"],
+                                               self._probe_deadline("SecurityScan", started))
+
+            body_hash, favicon_hash = page_hashes.get("body"), page_hashes.get("favicon")
+            if cached and body_hash and cached[3] == body_hash:
+                reusable = cached[1]
+            else:
+                reusable = cache.find_by_content(body_hash, favicon_hash)
+
+            if reusable and all(name in reusable for name in self.external_probes):
+                stop_tools.set()
+                cache.record("content_hits")
+                ColorPrint.info(f"Landing page of {subdomain} is unchanged; reusing WhatWeb/Wappalyzer results.")
+                tool_results = {name: reusable[name] for name in self.external_probes}
+            else:
+                cache.record("misses")
+                tool_results = {
+                    name: self._probe_result(subdomain, name, futures[name], self._probe_deadline(name, started))
+                    for name in self.external_probes
+                }
+        finally:
+            stop_tools.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        tech_details = {**tool_results, "SecurityScan": security_info}
+        technology = self._determine_primary_technology(tech_details)
+
+        # Only complete results are worth keeping
+        tools_failed = any(self._tool_failed(name, tool_results[name]) for name in self.external_probes)
+        if body_hash and not tools_failed:
+            cache.put(subdomain, technology, tech_details, body_hash, favicon_hash,
+                      profile=self.http_pool.host_profile(subdomain))
+        return technology, tech_details
+
+    def _probe_result(self, subdomain, name, future, deadline):
+        """Wait for one probe until `deadline`, turning errors and overruns into its failure value."""
         try:
-            result = subprocess.run(["wappalyzer", subdomain], capture_output=True, text=True)
-            return result.stdout
-        except (subprocess.SubprocessError, FileNotFoundError) as e:
-            return f"Wappalyzer error: {str(e)}"
-
-    def _active_scan(self, subdomain):
-        security_info = {
+            return future.result(timeout=max(0, deadline - time.monotonic()))
+        except FuturesTimeoutError:
+            ColorPrint.warning(f"{name} probe for {subdomain} timed out.")
+            return self._probe_failure(name, "timed out")
+        except Exception as e:
+            return self._probe_failure(name, e)
+
+    def _probe_deadline(self, name, started):
+        """When to stop waiting for a probe.
+
+        The active scan is cut off at its own budget; the tools enforce theirs
+        and get a grace period to report it, so no probe can hold the worker.
+        """
+        budget = self.probe_timeouts.get(name, 60)
+        return started + (budget if name == "SecurityScan" else budget + 5)
+
+    def _run_probes(self, subdomain, probes):
+        """Run every probe concurrently and collect each result within its own budget."""
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=len(probes))
+        futures = {name: executor.submit(probe, subdomain) for name, probe in probes.items()}
+        try:
+            # Keeps the report layout stable regardless of completion order
+            return {
+                name: self._probe_result(subdomain, name, future, self._probe_deadline(name, started))
+                for name, future in futures.items()
+            }
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _tool_failed(self, name, result):
+        """Whether a tool's output is a transient failure; a tool that is not installed is a stable result."""
+        result = str(result)
+        return result.startswith(f"{name} error") and not result.startswith(f"{name} error: not installed")
+
+    def _probe_failure(self, name, error):
+        if name == "SecurityScan":
+            return self._empty_security_info()
+        return f"{name} error: {str(error)}"
+
+    def _run_whatweb(self, subdomain, stop=None):
+        return self._run_tool("WhatWeb", ["whatweb", subdomain], stop)
+
+    def _run_wappalyzer(self, subdomain, stop=None):
+        return self._run_tool("Wappalyzer", ["wappalyzer", subdomain], stop)
+
+    def _run_tool(self, name, command, stop=None):
+        """Run an external tool within its budget; setting the `stop` event kills it early."""
+        deadline = time.monotonic() + self.probe_timeouts[name]
+        try:
+            # Its own process group, so anything the tool spawns is killed with it
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                       start_new_session=True)
+        except FileNotFoundError as e:
+            return f"{name} error: not installed ({str(e)})"
+        except (OSError, subprocess.SubprocessError) as e:
+            return f"{name} error: {str(e)}"
+        try:
+            while True:
+                try:
+                    # communicate() may be retried after a timeout without losing output
+                    return process.communicate(timeout=min(0.5, max(0, deadline - time.monotonic())))[0]
+                except subprocess.TimeoutExpired:
+                    if stop is not None and stop.is_set():
+                        return f"{name} error: stopped"
+                    if time.monotonic() >= deadline:
+                        return f"{name} error: timed out after {self.probe_timeouts[name]} seconds"
+        finally:
+            if process.poll() is None:
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass  # Already gone
+                process.communicate()
+
+    def _empty_security_info(self):
+        return {
             "server": {"name": "Unknown", "version": "Unknown"},
             "technologies": [],
             "headers": {},
@@ -157,15 +208,21 @@ class TechnologyDetector:
             "potential_vulnerabilities": []
         }
 
+    def _active_scan(self, subdomain, page_hashes=None):
+        """Probe the host directly; `page_hashes` receives the landing page and favicon hashes."""
+        security_info = self._empty_security_info()
+        page_hashes = {} if page_hashes is None else page_hashes
+
         try:
-            get_response = requests.get(subdomain, timeout=10, allow_redirects=True)
-            head_response = requests.head(subdomain, timeout=10, allow_redirects=True)
-            options_response = requests.options(subdomain, timeout=10, allow_redirects=True)
+            get_response = self.http_pool.get(subdomain, timeout=10, allow_redirects=True)
+            head_response = self.http_pool.head(subdomain, timeout=10, allow_redirects=True)
+            options_response = self.http_pool.options(subdomain, timeout=10, allow_redirects=True)
+            page_hashes["body"] = hashlib.sha256(get_response.content).hexdigest()
 
             self._analyze_headers(security_info, get_response.headers)
             self._analyze_http_methods(security_info, options_response)
             self._analyze_html_content(security_info, get_response.content.decode('utf-8', errors='ignore'), get_response.url)
-            self._analyze_favicon(security_info, get_response.url)
+            self._analyze_favicon(security_info, get_response.url, page_hashes)
 
             return security_info
 
@@ -255,10 +312,8 @@ class TechnologyDetector:
                 security_info["interesting_findings"].append(
                     f"Version information in HTML comment: {comment.strip()}"
                 )
-            for tech, patterns in self.tech_fingerprints.items():
-                for pattern in patterns:
-                    if pattern.search(comment_text):
-                        security_info["technologies"].append(f"{tech} (Comment)")
+            for tech in self.fingerprint_matcher.match(comment_text):
+                security_info["technologies"].append(f"{tech} (Comment)")
 
     def _check_script_paths(self, security_info, soup):
         scripts = soup.find_all('script', src=True)
@@ -269,45 +324,43 @@ class TechnologyDetector:
                 security_info["interesting_findings"].append(
                     f"Potentially sensitive script path: {src}"
                 )
-            for tech, patterns in self.tech_fingerprints.items():
-                for pattern in patterns:
-                    if pattern.search(src):
-                        security_info["technologies"].append(f"{tech} (Script Path)")
+            for tech in self.fingerprint_matcher.match(src):
+                security_info["technologies"].append(f"{tech} (Script Path)")
 
     def _check_meta_tags(self, security_info, soup):
         meta_generator = soup.find('meta', attrs={'name': 'generator'})
         if meta_generator:
             generator_content = meta_generator['content']
             security_info["technologies"].append(f"Meta Generator: {generator_content}")
-            for tech, patterns in self.tech_fingerprints.items():
-                for pattern in patterns:
-                    if pattern.search(generator_content):
-                        security_info["technologies"].append(f"{tech} (Meta Generator)")
+            for tech in self.fingerprint_matcher.match(generator_content):
+                security_info["technologies"].append(f"{tech} (Meta Generator)")
         # Add more meta tag checks here
         meta_framework = soup.find('meta', attrs={'name': 'framework'})
         if meta_framework and meta_framework['content']:
             security_info["technologies"].append(f"Meta Framework: {meta_framework['content']}")
 
     def _check_specific_patterns(self, security_info, content):
-        for tech, patterns in self.tech_fingerprints.items():
-            for pattern in patterns:
-                if pattern.search(content):
-                    security_info["technologies"].append(f"{tech} (Content Pattern)")
+        for tech in self.fingerprint_matcher.match(content):
+            security_info["technologies"].append(f"{tech} (Content Pattern)")
 
-    def _analyze_favicon(self, security_info, url):
+    def _analyze_favicon(self, security_info, url, page_hashes=None):
         try:
             favicon_url = f"{url.split('//')[0]}//{url.split('//')[1].split('/')[0]}/favicon.ico"
-            response = requests.get(favicon_url, timeout=5)
-            if response.status_code == 200 and 'image' in response.headers.get('Content-Type', ''):
-                # Use SHA-256 for more robust hashing
-                favicon_hash = hashlib.sha256(response.content).hexdigest()
-                if favicon_hash in self.favicon_hashes:
-                    security_info["technologies"].append(f"{self.favicon_hashes[favicon_hash]} (Favicon)")
-                else:
-                    # Consider also storing a base64 encoded version if needed
-                    readable_hash = base64.b64encode(hashlib.sha256(response.content).digest()).decode('utf-8')
-                    if readable_hash in self.favicon_hashes:
-                        security_info["technologies"].append(f"{self.favicon_hashes[readable_hash]} (Favicon)")
+            if self.favicon_cache:
+                hashes = self.favicon_cache.favicon_hashes(favicon_url, self.http_pool, self.fingerprint_db.favicon_hashes)
+            else:
+                response = self.http_pool.get(favicon_url, timeout=5)
+                hashes = None
+                if response.status_code == 200 and 'image' in response.headers.get('Content-Type', ''):
+                    hashes = self.fingerprint_db.favicon_hashes(response.content)
+
+            if hashes:
+                if page_hashes is not None:
+                    page_hashes["favicon"] = hashes["sha256"]
+                # SHA-256 (hex/base64) and Shodan-style mmh3 hashes, looked up in an O(1) index
+                technology = self.fingerprint_db.match_favicon_hashes(hashes)
+                if technology:
+                    security_info["technologies"].append(f"{technology} (Favicon)")
 
         except requests.RequestException:
             pass # Ignore favicon errors
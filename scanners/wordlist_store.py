@@ -0,0 +1,180 @@
+# scanners/wordlist_store.py
+import os
+import mmap
+import json
+import array
+import hashlib
+from utils.color_print import ColorPrint
+from utils.atomic_file import atomic_write
+from scanners.fingerprint_db import DEFAULT_CACHE_DIR
+
+# Extensions that only make sense on one stack, excluded from the others' lists
+_PHP_ONLY = (".php", ".php3", ".php4", ".php5", ".phtml")
+_JAVA_ONLY = (".jsp", ".jspx", ".jsf", ".do", ".action")
+_DOTNET_ONLY = (".asp", ".aspx", ".ashx", ".asmx", ".axd")
+
+DEFAULT_COMPOSITIONS = {
+    "php": {"include": ["php", "general"], "exclude_extensions": _JAVA_ONLY + _DOTNET_ONLY},
+    "jsp": {"include": ["jsp", "general"], "exclude_extensions": _PHP_ONLY + _DOTNET_ONLY},
+    "general": {"include": ["general"]},
+}
+
+
+class CompiledWordlist:
+    """A deduplicated wordlist compiled to disk, read through mmap.
+
+    `path` is plain text ffuf can read; `index_path` holds each entry's
+    byte offset (uint64), so any run of entries is found without scanning.
+    """
+    def __init__(self, path, index_path):
+        self.path = path
+        self.index_path = index_path
+        self._data = None
+        self._offsets = None
+        self._pid = None
+
+    def __getstate__(self):
+        return {"path": self.path, "index_path": self.index_path, "_data": None, "_offsets": None, "_pid": None}
+
+    def _maps(self):
+        if self._pid != os.getpid():
+            self._data = self._map(self.path)
+            self._offsets = memoryview(self._map(self.index_path)).cast("Q")
+            self._pid = os.getpid()
+        return self._data, self._offsets
+
+    def _map(self, path):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self._maps()[1]) - 1
+
+    def __getitem__(self, position):
+        data, offsets = self._maps()
+        if not 0 <= position < len(offsets) - 1:
+            raise IndexError(position)
+        return data[offsets[position]:offsets[position + 1] - 1].decode("utf-8")
+
+    def slice_bytes(self, start, end):
+        """Entries [start, end) as newline-terminated bytes, ready to write out as a shard."""
+        data, offsets = self._maps()
+        count = len(offsets) - 1
+        return data[offsets[min(start, count)]:offsets[min(end, count)]]
+
+
+class WordlistStore:
+    """Technology wordlists compiled from the fuzzer's source lists.
+
+    A list is rebuilt only when its composition or a source changes; a
+    ranked technology gets its ranked entries first (see rank()).
+    """
+    def __init__(self, sources, compositions=None, cache_dir=DEFAULT_CACHE_DIR):
+        self.sources = sources  # name -> text file; the fuzzer's wordlists dict
+        self.compositions = compositions or DEFAULT_COMPOSITIONS
+        self.cache_dir = os.path.join(cache_dir, "wordlists")
+        self.rankings = {}  # technology (None for the fallback) -> (words, digest)
+        self._compiled = {}
+
+    def rank(self, technology, words):
+        """Put `words` first, in this order, in the technology's list; None sets the fallback ranking."""
+        digest = hashlib.sha256("\n".join(words).encode("utf-8")).hexdigest()[:16]
+        self.rankings[technology] = (list(words), digest)
+
+    def get(self, technology):
+        """Return the CompiledWordlist for a technology, compiling it on first use."""
+        name = technology if technology in self.compositions else "general"
+        composition = self.compositions[name]
+        key = self._key(name, composition)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            path, index_path = self._paths(f"{name}-{key}")
+            if not (os.path.exists(path) and os.path.exists(index_path)):
+                self._compile(name, composition, path, index_path)
+            compiled = self._compiled[key] = CompiledWordlist(path, index_path)
+
+        ranking = self.rankings.get(technology) or self.rankings.get(None)
+        if not ranking:
+            return compiled
+        words, digest = ranking
+        ranked_key = f"{key}-{digest}"
+        ranked = self._compiled.get(ranked_key)
+        if ranked is None:
+            path, index_path = self._paths(f"{technology or name}-{ranked_key}")
+            if not (os.path.exists(path) and os.path.exists(index_path)):
+                with open(compiled.path, "r", encoding="utf-8") as f:
+                    entries = [line.rstrip("\n") for line in f]
+                present = set(entries)
+                head = [word for word in words if word in present]
+                promoted = set(head)
+                self._write(head + [word for word in entries if word not in promoted], path, index_path)
+            ranked = self._compiled[ranked_key] = CompiledWordlist(path, index_path)
+        return ranked
+
+    def load(self, path):
+        """The CompiledWordlist compiled to `path` earlier, or None if its files are gone."""
+        index_path = f"{os.path.splitext(path)[0]}.idx"
+        if not (os.path.exists(path) and os.path.exists(index_path)):
+            return None
+        return CompiledWordlist(path, index_path)
+
+    def _paths(self, stem):
+        return os.path.join(self.cache_dir, f"{stem}.txt"), os.path.join(self.cache_dir, f"{stem}.idx")
+
+    def _key(self, name, composition):
+        signature = {"composition": composition, "sources": {}}
+        for source in composition.get("include", []) + composition.get("exclude", []):
+            path = self.sources.get(source)
+            try:
+                stat = os.stat(path)
+                signature["sources"][source] = [path, stat.st_size, int(stat.st_mtime)]
+            except (OSError, TypeError):
+                signature["sources"][source] = None
+        return hashlib.sha256(json.dumps(signature, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _read(self, source):
+        path = self.sources.get(source)
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return [line.strip() for line in f]
+
+    def _compile(self, name, composition, path, index_path):
+        excluded = set()
+        for source in composition.get("exclude", []):
+            excluded.update(self._read(source) or [])
+        extensions = tuple(composition.get("exclude_extensions", ()))
+
+        entries, seen, found = [], set(), False
+        for source in composition.get("include", []):
+            words = self._read(source)
+            if words is None:
+                ColorPrint.warning(f"Wordlist source '{source}' ({self.sources.get(source)}) is missing.")
+                continue
+            found = True
+            for word in words:
+                if not word or word in seen or word in excluded:
+                    continue
+                if extensions and word.lower().endswith(extensions):
+                    continue
+                seen.add(word)
+                entries.append(word)
+        if not found:
+            raise FileNotFoundError(f"No source wordlist found for '{name}'")
+        self._write(entries, path, index_path)
+        ColorPrint.info(f"Compiled the {name} wordlist: {len(entries)} unique entries.")
+
+    def _write(self, entries, path, index_path):
+        offsets = array.array("Q", [0])
+        encoded = [f"{word}\n".encode("utf-8") for word in entries]
+        for entry in encoded:
+            offsets.append(offsets[-1] + len(entry))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # The index goes last, so concurrent workers never find a list without its data
+        with atomic_write(path, "wb") as f:
+            f.writelines(encoded)
+        with atomic_write(index_path, "wb") as f:
+            offsets.tofile(f)
@@ -0,0 +1,66 @@
+# tests/conftest.py
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanners.fuzzer import Fuzzer
+from scanners.http_engine import AsyncHttpEngine
+from scanners.wordlist_store import WordlistStore
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Base for the local hosts the tests fuzz; subclasses implement do_GET."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture(scope="module")
+def stand_in_server():
+    """Start a local server for a handler class and return its base URL; stopped after the module."""
+    servers = []
+
+    def start(handler):
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        httpd.daemon_threads = True
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        servers.append(httpd)
+        return f"http://127.0.0.1:{httpd.server_address[1]}"
+
+    yield start
+    for httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.fixture
+def native_fuzzer(tmp_path):
+    """Build a native-engine Fuzzer whose "general" wordlist holds `words`, cached under tmp_path.
+
+    The list is written once, so later calls in a test see the same file, as after a restart.
+    """
+    def build(words, **kwargs):
+        source = tmp_path / "general.txt"
+        if not source.exists():
+            source.write_text("\n".join(words) + "\n")
+        kwargs.setdefault("native_engine", AsyncHttpEngine())
+        fuzzer = Fuzzer(str(tmp_path), engine="native",
+                        wordlist_store=WordlistStore({"general": str(source)}, cache_dir=str(tmp_path)), **kwargs)
+        fuzzer.wordlists["general"] = str(source)
+        return fuzzer
+
+    return build
@@ -0,0 +1,66 @@
+# tests/test_calibration.py
+import os
+import asyncio
+import tempfile
+
+import pytest
+
+from scanners.calibration import Calibrator
+from scanners.http_engine import AsyncHttpEngine
+from conftest import StandInHandler
+
+FORBIDDEN = [f"private{i}" for i in range(80)]
+
+
+class ClusterHandler(StandInHandler):
+    """80 real 403 directories with one shared error page, and a wildcard behind /files/*.txt."""
+    def do_GET(self):
+        path = self.path.split("?")[0].strip("/")
+        if path in FORBIDDEN:
+            self._send(403, b"<h1>Forbidden</h1>\nYou do not have access.")
+        elif path.startswith("files/") and path.endswith(".txt"):
+            self._send(200, b"file placeholder\nfor every name")
+        else:
+            self._send(404, b"not found")
+
+
+@pytest.fixture(scope="module")
+def server(stand_in_server):
+    return stand_in_server(ClusterHandler)
+
+
+def fuzz(server, words, cluster_limit=50):
+    async def run():
+        engine = AsyncHttpEngine()
+        calibrator = await Calibrator(cluster_limit=cluster_limit).calibrate(engine, server)
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as wordlist:
+            wordlist.write("\n".join(words) + "\n")
+        try:
+            hits = [item async for item in engine.fuzz(server, wordlist.name, threads=8,
+                                                       match=lambda s: s != 404, calibrator=calibrator)]
+        finally:
+            os.remove(wordlist.name)
+        return hits, calibrator
+
+    return asyncio.run(run())
+
+
+def test_large_cluster_of_real_hits_is_kept(server):
+    hits, calibrator = fuzz(server, FORBIDDEN + ["missing", "nothing"])
+    assert sorted(item["input"]["FUZZ"] for item in hits) == sorted(FORBIDDEN)
+    assert calibrator.dropped == 0
+
+
+def test_wildcard_cluster_is_dropped_once_reproduced(server):
+    words = [f"files/name{i}.txt" for i in range(30)]
+    hits, calibrator = fuzz(server, words, cluster_limit=10)
+    assert len(hits) == 10
+    assert calibrator.dropped == 20
+
+
+def test_shaped_like_keeps_directories_extension_and_slash():
+    calibrator = Calibrator()
+    shaped = calibrator._shaped_like("files/report.tar.gz")
+    assert shaped.startswith("files/") and shaped.endswith(".tar.gz") and shaped != "files/report.tar.gz"
+    assert calibrator._shaped_like("backup/").endswith("/")
+    assert "/" not in calibrator._shaped_like("admin")
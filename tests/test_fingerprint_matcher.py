@@ -0,0 +1,46 @@
+# tests/test_fingerprint_matcher.py
+import re
+
+import pytest
+
+from scanners.fingerprint_matcher import FingerprintMatcher
+
+FINGERPRINTS = {
+    "WordPress": ["(?i)wordpress", r"wp-content/themes/"],
+    "Joomla": [("php\\?option=com_", 0), ("joomla!", re.IGNORECASE)],
+    "Drupal": [re.compile(r"Drupal \d+")],
+    "Scoped": [r"(?i:generator)=Hugo"],
+    "Short": [r"v\d"],
+}
+
+
+def reference_match(text):
+    """The old loop: one search per pattern."""
+    found = []
+    for technology, patterns in FINGERPRINTS.items():
+        for pattern in patterns:
+            source, flags = ((pattern, 0) if isinstance(pattern, str)
+                             else pattern if isinstance(pattern, tuple) else (pattern.pattern, pattern.flags))
+            if re.search(source, text, flags):
+                found.append(technology)
+                break
+    return found
+
+
+@pytest.mark.parametrize("text", [
+    "Powered by WordPress",
+    "POWERED BY WORDPRESS, wp-content/themes/x",
+    "index.php?option=com_content and JOOMLA!",
+    "Drupal 10 site",
+    "drupal 10 site",
+    "GENERATOR=Hugo",
+    "generator=hugo",
+    "release v2",
+    "nothing to see",
+])
+def test_matches_the_per_pattern_loop(text):
+    assert FingerprintMatcher(FINGERPRINTS).match(text) == reference_match(text)
+
+
+def test_inline_ignorecase_flag_folds_the_anchor():
+    assert FingerprintMatcher({"WP": ["(?i)wordpress"]}).match("Powered by WordPress") == ["WP"]
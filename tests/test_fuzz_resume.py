@@ -0,0 +1,107 @@
+# tests/test_fuzz_resume.py
+import os
+import asyncio
+
+import pytest
+
+from scanners.fuzzer import FuzzStream
+from utils.result_store import ResultStore
+from conftest import StandInHandler
+
+WORDS = [f"word{i}" for i in range(30)]
+HITS = {"word12", "word20", "word27"}
+
+
+class HitsHandler(StandInHandler):
+    requested = []
+    throttle_from = None  # Index of the first word answered with 429
+
+    def do_GET(self):
+        word = self.path.strip("/")
+        HitsHandler.requested.append(word)
+        limit = HitsHandler.throttle_from
+        if limit is not None and word in WORDS and WORDS.index(word) >= limit:
+            self._send(429, b"")
+        elif word in HITS:
+            self._send(200, f"page {word}".encode())
+        else:
+            self._send(404, b"not found")
+
+
+@pytest.fixture(scope="module")
+def server(stand_in_server):
+    return stand_in_server(HitsHandler)
+
+
+@pytest.fixture
+def make_fuzzer(native_fuzzer, tmp_path):
+    """Build a fresh Fuzzer over the same store and cache, as after a restart."""
+    def build(ranking):
+        fuzzer = native_fuzzer(WORDS, result_store=ResultStore(str(tmp_path / "findings.db")))
+        fuzzer.wordlist_store.rank("general", ranking)
+        return fuzzer
+    return build
+
+
+def run(fuzzer, server, word_limit=None):
+    async def collect():
+        stream = fuzzer.stream_subdomain(server, "general", word_limit=word_limit)
+        return [item["url"].rsplit("/", 1)[1] async for item in stream]
+    return asyncio.run(collect())
+
+
+def test_full_run_resumes_on_the_checkpointed_list_after_a_re_rank(server, make_fuzzer, monkeypatch):
+    monkeypatch.setattr(FuzzStream, "shard_size", 5)
+    first = make_fuzzer(["word27", "word12"])
+    fast = run(first, server, word_limit=10)
+    assert sorted(fast) == ["word12", "word27"]
+    ranked_path = first.compiled_wordlist("general").path
+
+    # After a restart the hit history ranks the list differently, so its compiled file has another name
+    second = make_fuzzer(["word20"])
+    assert second.compiled_wordlist("general").path != ranked_path
+    HitsHandler.requested.clear()
+    full = run(second, server)
+
+    assert sorted(full) == ["word12", "word20", "word27"]
+    fuzzed = {word for word in HitsHandler.requested if word.startswith("word")}
+    assert not fuzzed & {"word27", "word12", *WORDS[:8]}  # The fast pass's ten words are not requested again
+    assert fuzzed == set(WORDS) - {"word27", "word12", *WORDS[:8]}
+    assert second.result_store.checkpoint(server) == (None, 0)
+
+
+def test_changed_checkpointed_list_starts_over(server, make_fuzzer, monkeypatch):
+    monkeypatch.setattr(FuzzStream, "shard_size", 5)
+    first = make_fuzzer(["word27"])
+    run(first, server, word_limit=10)
+    with open(first.compiled_wordlist("general").path, "a") as f:
+        f.write("extra\n")
+    os.utime(first.compiled_wordlist("general").path, (0, 0))
+
+    second = make_fuzzer(["word20"])
+    HitsHandler.requested.clear()
+    assert sorted(run(second, server)) == ["word12", "word20", "word27"]
+    assert "word27" in HitsHandler.requested
+
+
+def test_throttled_run_is_partial_and_resumes_from_its_last_shard(server, make_fuzzer, monkeypatch):
+    monkeypatch.setattr(FuzzStream, "shard_size", 5)
+    monkeypatch.setattr(FuzzStream, "throttle_limit", 2)
+    monkeypatch.setattr(HitsHandler, "throttle_from", 10)
+    first = make_fuzzer([])
+    first.rate_controller.max_restarts = 1
+
+    async def throttled_run():
+        stream = first.stream_subdomain(server, "general")
+        items = [item async for item in stream]
+        return stream, items
+    stream, items = asyncio.run(throttled_run())
+    assert stream.throttled and not stream.timed_out and not stream.failed
+    assert stream.restarts == 1
+    assert items == []
+    assert first.result_store.checkpoint(server)[1] == 10
+
+    monkeypatch.setattr(HitsHandler, "throttle_from", None)
+    HitsHandler.requested.clear()
+    assert sorted(run(make_fuzzer([]), server)) == ["word12", "word20", "word27"]
+    assert not {word for word in HitsHandler.requested if word in WORDS} & set(WORDS[:10])
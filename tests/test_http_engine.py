@@ -0,0 +1,131 @@
+# tests/test_http_engine.py
+import os
+import time
+import asyncio
+import tempfile
+
+import pytest
+
+from scanners.http_engine import AsyncHttpEngine
+from conftest import StandInHandler
+
+
+class FramingHandler(StandInHandler):
+    """Local stand-in for a fuzzed host, one path per framing the engine must handle."""
+    connections = set()
+
+    def do_GET(self):
+        FramingHandler.connections.add(self.client_address)
+        path = self.path.split("?")[0]
+        if path in ("/", "/content-length", "/admin"):
+            self._send(200, b"hello world\nsecond line", {"Content-Type": "text/html"})
+        elif path == "/chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (b"hello ", b"chunked ", b"world"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        elif path == "/close":
+            # No framing at all: the body ends when the connection does
+            self.send_response(200)
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(b"closed body")
+            self.close_connection = True
+        elif path == "/old":
+            self._send(301, b"", {"Location": "/new/"})
+        elif path == "/slow":
+            time.sleep(2)
+            self._send(200, b"late")
+        else:
+            self._send(404, b"not found")
+
+
+@pytest.fixture(scope="module")
+def server(stand_in_server):
+    return stand_in_server(FramingHandler)
+
+
+def fetch(engine, url):
+    return asyncio.run(engine.request("GET", url))
+
+
+def test_content_length_body(server):
+    response = fetch(AsyncHttpEngine(), f"{server}/content-length")
+    assert response.status == 200
+    assert response.body == b"hello world\nsecond line"
+    assert response.length == len(response.body)
+    assert response.headers["content-type"] == "text/html"
+
+
+def test_chunked_body(server):
+    response = fetch(AsyncHttpEngine(), f"{server}/chunked")
+    assert response.body == b"hello chunked world"
+    assert response.length == 19
+
+
+def test_close_delimited_body(server):
+    response = fetch(AsyncHttpEngine(), f"{server}/close")
+    assert response.body == b"closed body"
+
+
+def test_keep_alive_connection_is_reused(server):
+    engine = AsyncHttpEngine()
+
+    async def run():
+        for _ in range(5):
+            await engine.request("GET", f"{server}/content-length")
+
+    FramingHandler.connections.clear()
+    asyncio.run(run())
+    assert len(FramingHandler.connections) == 1
+
+
+def test_request_deadline(server):
+    engine = AsyncHttpEngine(timeout=0.5)
+    started = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        fetch(engine, f"{server}/slow")
+    assert time.monotonic() - started < 1.5
+
+
+def test_fuzz_yields_ffuf_shaped_results(server):
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as wordlist:
+        wordlist.write("admin\nmissing\nold\nchunked\n")
+
+    async def run():
+        engine = AsyncHttpEngine()
+        return [item async for item in engine.fuzz(server, wordlist.name, threads=2, match=lambda s: s != 404)]
+
+    try:
+        results = {item["input"]["FUZZ"]: item for item in asyncio.run(run())}
+    finally:
+        os.remove(wordlist.name)
+
+    assert set(results) == {"admin", "old", "chunked"}
+    admin = results["admin"]
+    assert set(admin) == {"input", "position", "status", "length", "words", "lines", "content-type",
+                          "redirectlocation", "url", "duration", "host"}
+    assert admin["position"] == 1
+    assert admin["url"] == f"{server}/admin"
+    assert (admin["status"], admin["length"], admin["words"], admin["lines"]) == (200, 23, 3, 2)
+    assert admin["content-type"] == "text/html"
+    assert results["old"]["status"] == 301
+    assert results["old"]["redirectlocation"] == "/new/"
+    assert admin["host"] == server.split("//")[1]
+
+
+def test_fuzz_stream_deadline_keeps_partial_results(server, native_fuzzer):
+    fuzzer = native_fuzzer(["admin"] + ["slow"] * 20, native_engine=AsyncHttpEngine(timeout=5))
+
+    async def run():
+        stream = fuzzer.stream_subdomain(server, "general", timeout=1.5)
+        items = [item async for item in stream]
+        return stream, items
+
+    started = time.monotonic()
+    stream, items = asyncio.run(run())
+    assert time.monotonic() - started < 4
+    assert stream.timed_out and not stream.failed
+    assert [item["input"]["FUZZ"] for item in items] == ["admin"]
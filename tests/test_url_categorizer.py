@@ -0,0 +1,77 @@
+# tests/test_url_categorizer.py
+import re
+import random
+
+import pytest
+
+from reporting.url_categorizer import UrlCategorizer, CATEGORY_PATTERNS, default_categorizer
+
+
+def reference_categorize(url):
+    """Straight per-keyword loop: regex entries as regexes, the rest as substrings."""
+    url = url.lower()
+    for category, keywords in CATEGORY_PATTERNS.items():
+        for keyword in keywords:
+            if UrlCategorizer.regex_syntax.search(keyword):
+                if re.search(keyword, url):
+                    return category
+            elif keyword.lower() in url:
+                return category
+    return UrlCategorizer.fallback
+
+
+@pytest.mark.parametrize("url, category", [
+    # Regex entries match as regexes, not as literal substrings
+    ("https://example.com/admin12", "Admin"),
+    ("https://example.com/control7/panel", "Admin"),
+    ("https://example.com/data.json", "API"),
+    ("https://example.com/feed.xml", "API"),
+    ("https://example.com/v2/orders/42", "API"),
+    ("https://example.com/2024/01/02/post-title", "Content"),
+    ("https://example.com/img/logo.PNG", "Assets"),
+    ("https://example.com/db.sql", "Data"),
+    ("https://example.com/app.log", "System"),
+    ("https://example.com/phpinfo.php", "Auth"),
+    # Literal keywords, matched case-insensitively
+    ("https://example.com/CHANGELOG", "Docs"),
+    ("https://example.com/Users/", "User"),
+    ("https://example.com/.git/HEAD", "Dev"),
+    ("https://example.com/nothing-here", "Misc"),
+])
+def test_categories(url, category):
+    assert default_categorizer.categorize(url) == category
+
+
+def test_first_match_precedence():
+    # "/login" is listed under both Admin and Auth; Admin comes first
+    assert default_categorizer.categorize("https://example.com/login") == "Admin"
+    # "/api/" (API) wins over ".json" (also API) and "/data/" (Data, later)
+    assert default_categorizer.categorize("https://example.com/data/api/x.json") == "API"
+    # "/admin" (Admin) wins over ".bak" (Data and Backup)
+    assert default_categorizer.categorize("https://example.com/admin/site.bak") == "Admin"
+
+
+def test_php_regex_moves_config_php_to_auth():
+    # With '\.php$' matched as a regex, Auth (listed before Config) now claims /config.php,
+    # which the old substring test left to Config
+    assert default_categorizer.categorize("https://example.com/config.php") == "Auth"
+    assert default_categorizer.categorize("https://example.com/config.php.bak") == "Config"
+
+
+def test_custom_patterns_and_fallback():
+    categorizer = UrlCategorizer({"First": ["/a"], "Second": [r"/b\d+$"], "Empty": []})
+    assert categorizer.categorize("https://example.com/a/b12") == "First"
+    assert categorizer.categorize("https://example.com/b12") == "Second"
+    assert categorizer.categorize("https://example.com/b12x") == "Misc"
+    assert categorizer.categories == ["First", "Second", "Empty", "Misc"]
+
+
+def test_matches_reference_on_random_urls():
+    random.seed(7)
+    segments = [keyword.replace("\\", "").replace("$", "") for keywords in CATEGORY_PATTERNS.values()
+                for keyword in keywords]
+    segments += ["foo", "bar", "x1", "2024", "01", ".PHP", ".json", "/v2/", "index", "Admin3"]
+    for _ in range(20000):
+        path = "/".join(random.choice(segments).strip("/") for _ in range(random.randint(1, 3)))
+        url = f"https://host{random.randint(1, 50)}.example.com/{path}"
+        assert default_categorizer.categorize(url) == reference_categorize(url), url
@@ -0,0 +1,19 @@
+# utils/atomic_file.py
+import os
+from contextlib import contextmanager
+
+@contextmanager
+def atomic_write(path, mode="w", encoding="utf-8"):
+    """Write `path` through a temporary file that replaces it only once the block completes.
+
+    Other processes see the old file or the new one, never a partial write;
+    if the block raises, the temporary file is removed and `path` is left alone.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,145 @@
+# utils/db_pool.py
+import os
+import threading
+import time
+import mysql.connector
+from mysql.connector import pooling
+from .color_print import ColorPrint
+
+class DatabasePool:
+    """MySQL connection pool shared by everything in one process, rebuilt after a fork."""
+    def __init__(self, db_config, pool_size=5, acquire_timeout=30):
+        self.db_config = db_config
+        self.pool_size = pool_size
+        self.acquire_timeout = acquire_timeout  # Seconds to wait for a free connection
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_pid"] = None
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = pooling.MySQLConnectionPool(
+                    pool_name=f"fuzz_automation_{os.getpid()}",
+                    pool_size=self.pool_size,
+                    pool_reset_session=True,
+                    **self.db_config
+                )
+                self._pid = os.getpid()
+            return self._pool
+
+    def get_connection(self):
+        """Borrow a connection; closing it returns it to the pool."""
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            try:
+                return self._get_pool().get_connection()
+            except mysql.connector.errors.PoolError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.1)
+
+
+class FuzzStatusWriter:
+    """Buffers fuzz status updates and writes them in batched transactions.
+
+    Call close() on shutdown to write whatever is still buffered.
+    """
+    # MySQL assigns left to right, so fuzz_resumes counts the partial (5) or errored (3) status just set
+    query = ("UPDATE live SET fuzz = %s, directories_found = %s, fuzz_resumes = fuzz_resumes + (fuzz IN (3, 5)), "
+             "claimed_by = NULL, lease_expires = NULL WHERE alive = %s")
+
+    def __init__(self, db_pool, batch_size=50, flush_interval=5):
+        self.db_pool = db_pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._flusher = None
+        self._pid = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(_buffer=[], _lock=None, _wake=None, _flusher=None, _pid=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+    def add(self, subdomain, status, directories_found=0):
+        """Queue a status update, flushing right away once the batch is full."""
+        self._ensure_flusher()
+        with self._lock:
+            self._buffer.append((status, directories_found, subdomain))
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        """Write every buffered update in a single transaction."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+
+        conn = cursor = None
+        try:
+            conn = self.db_pool.get_connection()
+            cursor = conn.cursor()
+            cursor.executemany(self.query, batch)
+            conn.commit()
+        except mysql.connector.Error as err:
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except mysql.connector.Error:
+                    pass  # The connection itself is gone
+            ColorPrint.error(f"Error writing {len(batch)} fuzz status updates: {err}")
+            # Keep the updates for the next flush rather than losing them
+            with self._lock:
+                self._buffer[:0] = batch
+        finally:
+            if cursor is not None:
+                cursor.close()
+            if conn is not None:
+                conn.close()
+
+    def close(self):
+        """Stop the background flusher and write any remaining updates."""
+        self._closed = True
+        if self._flusher and self._pid == os.getpid():
+            self._wake.set()
+            self._flusher.join()
+        self.flush()
+
+    def _ensure_flusher(self):
+        if self._flusher is None or self._pid != os.getpid() or not self._flusher.is_alive():
+            self._pid = os.getpid()
+            self._closed = False
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+
+    def _flush_periodically(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # The batch stays buffered; keep the thread alive for the next attempt
+                ColorPrint.error(f"Error flushing fuzz status updates: {str(e)}")
@@ -0,0 +1,143 @@
+# utils/http_pool.py
+import os
+import time
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class HttpSessionPool:
+    """Keep-alive HTTP session shared by every prober in a process.
+
+    Limits concurrent requests per host and tracks each host's latency
+    and failures for host_profile().
+    """
+    throttle_statuses = (429, 503)
+    max_samples = 50  # Latency samples kept per host
+    def __init__(self, pool_connections=50, pool_maxsize=20, per_host_limit=4,
+                 retries=2, backoff_factor=0.3, proxies=None, verify=True):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.per_host_limit = per_host_limit
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.proxies = proxies or {}
+        self.verify = verify
+        self._session = None
+        self._pid = None
+        self._host_limits = {}
+        self._host_stats = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(_session=None, _pid=None, _host_limits={}, _host_stats={}, _lock=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None or self._pid != os.getpid():
+                self._session = self._build_session()
+                self._host_limits = {}
+                self._pid = os.getpid()
+            return self._session
+
+    def _build_session(self):
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=None,  # Every probe is idempotent
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.proxies.update(self.proxies)
+        session.verify = self.verify
+        return session
+
+    @contextmanager
+    def _host_slot(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = self._host_limits[host] = threading.BoundedSemaphore(self.per_host_limit)
+        with limit:
+            yield
+
+    def request(self, method, url, **kwargs):
+        session = self.session
+        with self._host_slot(url):
+            started = time.monotonic()
+            try:
+                response = session.request(method, url, **kwargs)
+            except requests.RequestException:
+                self._record(url, time.monotonic() - started, None)
+                raise
+            self._record(url, time.monotonic() - started, response.status_code)
+            return response
+
+    def _record(self, url, elapsed, status):
+        with self._lock:
+            stats = self._host_stats.setdefault(urlsplit(url).netloc, {"requests": 0, "errors": 0, "throttled": 0, "latencies": []})
+            stats["requests"] += 1
+            if status is None or status >= 500:
+                stats["errors"] += 1
+            if status in self.throttle_statuses:
+                stats["throttled"] += 1
+            if status is not None:
+                stats["latencies"] = stats["latencies"][-(self.max_samples - 1):] + [elapsed]
+
+    def host_profile(self, url):
+        """Return what this process has seen of a host: request, error and throttle counts,
+        error rate and median latency in seconds (None before any response)."""
+        with self._lock:
+            stats = self._host_stats.get(urlsplit(url).netloc)
+            if stats is None:
+                return {"requests": 0, "errors": 0, "throttled": 0, "error_rate": 0.0, "latency": None}
+            latencies = sorted(stats["latencies"])
+            return {
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "throttled": stats["throttled"],
+                "error_rate": stats["errors"] / stats["requests"],
+                "latency": latencies[len(latencies) // 2] if latencies else None
+            }
+
+    def seed_profile(self, url, profile):
+        """Adopt a host_profile() measured earlier (e.g. a cached one) until this process measures its own."""
+        if not profile or profile.get("latency") is None:
+            return
+        with self._lock:
+            self._host_stats.setdefault(urlsplit(url).netloc, {
+                "requests": profile["requests"],
+                "errors": profile["errors"],
+                "throttled": profile["throttled"],
+                "latencies": [profile["latency"]]
+            })
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def options(self, url, **kwargs):
+        return self.request("OPTIONS", url, **kwargs)
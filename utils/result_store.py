@@ -0,0 +1,186 @@
+# utils/result_store.py
+import time
+from urllib.parse import urlsplit
+from utils.sqlite_db import SqliteDatabase
+
+class ResultStore(SqliteDatabase):
+    """Local SQLite store of every fuzz hit, indexed for cross-host queries.
+
+    Also holds the wordlist checkpoints of unfinished runs and the
+    per-technology hit counts that order later runs' wordlists.
+    """
+    schema = """
+        CREATE TABLE IF NOT EXISTS hosts (
+            id INTEGER PRIMARY KEY,
+            host TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS findings (
+            id INTEGER PRIMARY KEY,
+            host_id INTEGER NOT NULL REFERENCES hosts(id),
+            path TEXT NOT NULL,
+            status INTEGER,
+            length INTEGER,
+            words INTEGER,
+            lines INTEGER,
+            redirect TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_findings_host ON findings (host_id);
+        CREATE INDEX IF NOT EXISTS idx_findings_path ON findings (path);
+        CREATE INDEX IF NOT EXISTS idx_findings_status ON findings (status, host_id);
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            host TEXT PRIMARY KEY,
+            wordlist TEXT NOT NULL,
+            word_offset INTEGER NOT NULL,
+            updated REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS path_stats (
+            technology TEXT NOT NULL,
+            word TEXT NOT NULL,
+            hits INTEGER NOT NULL,
+            PRIMARY KEY (technology, word)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_path_stats_hits ON path_stats (technology, hits);
+        CREATE TABLE IF NOT EXISTS stat_hosts (
+            host TEXT PRIMARY KEY,
+            technology TEXT NOT NULL
+        );
+    """
+
+    synchronous = "NORMAL"
+
+    def _host_id(self, conn, host):
+        conn.execute("INSERT OR IGNORE INTO hosts (host) VALUES (?)", (host,))
+        return conn.execute("SELECT id FROM hosts WHERE host = ?", (host,)).fetchone()[0]
+
+    def clear_host(self, host):
+        """Drop a host's earlier findings before it is fuzzed again."""
+        with self._lock:
+            conn = self.conn
+            with conn:
+                conn.execute("DELETE FROM findings WHERE host_id = (SELECT id FROM hosts WHERE host = ?)", (host,))
+
+    def add_many(self, host, items):
+        """Append a batch of ffuf hits for one host in a single transaction."""
+        rows = [
+            (urlsplit(item.get('url') or '').path or '/', item.get('status'), item.get('length'),
+             item.get('words'), item.get('lines'), item.get('redirectlocation') or None)
+            for item in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            conn = self.conn
+            with conn:
+                host_id = self._host_id(conn, host)
+                conn.executemany(
+                    "INSERT INTO findings (host_id, path, status, length, words, lines, redirect) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(host_id, *row) for row in rows]
+                )
+
+    def checkpoint(self, host):
+        """Return (wordlist, words already fuzzed) for host's checkpoint, or (None, 0) without one."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT wordlist, word_offset FROM checkpoints WHERE host = ?", (host,)
+            ).fetchone()
+        return tuple(row) if row else (None, 0)
+
+    def save_checkpoint(self, host, wordlist, word_offset):
+        with self._lock:
+            conn = self.conn
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints (host, wordlist, word_offset, updated) VALUES (?, ?, ?, ?)",
+                    (host, wordlist, word_offset, time.time())
+                )
+
+    def clear_checkpoint(self, host):
+        with self._lock:
+            conn = self.conn
+            with conn:
+                conn.execute("DELETE FROM checkpoints WHERE host = ?", (host,))
+
+    def record_path_hits(self, host, technology, words):
+        """Count one hit for each wordlist entry in `words`, once per host."""
+        with self._lock:
+            conn = self.conn
+            with conn:
+                if conn.execute("INSERT OR IGNORE INTO stat_hosts (host, technology) VALUES (?, ?)",
+                                (host, technology)).rowcount == 0:
+                    return  # A re-fuzzed host has already been counted
+                conn.executemany(
+                    "INSERT INTO path_stats (technology, word, hits) VALUES (?, ?, 1) "
+                    "ON CONFLICT (technology, word) DO UPDATE SET hits = hits + 1",
+                    [(technology, word) for word in set(words)]
+                )
+
+    def top_paths(self, technology=None, limit=1000):
+        """Return [(word, hosts hit)] with the most hits, for one technology or across all of them."""
+        if technology is None:
+            query = "SELECT word, SUM(hits) AS total FROM path_stats GROUP BY word ORDER BY total DESC, word LIMIT ?"
+            params = (limit,)
+        else:
+            query = "SELECT word, hits FROM path_stats WHERE technology = ? ORDER BY hits DESC, word LIMIT ?"
+            params = (technology, limit)
+        with self._lock:
+            return self.conn.execute(query, params).fetchall()
+
+    def stat_hosts(self):
+        """Return {technology: hosts counted in path_stats}."""
+        with self._lock:
+            return dict(self.conn.execute("SELECT technology, COUNT(*) FROM stat_hosts GROUP BY technology").fetchall())
+
+    def findings(self, host, batch_size=1000):
+        """Yield a host's hits as ffuf-style dicts, in the order they were found."""
+        parts = urlsplit(host)
+        base = f"{parts.scheme}://{parts.netloc}" if parts.netloc else host.rstrip('/')
+        with self._lock:
+            cursor = self.conn.execute(
+                "SELECT f.path, f.status, f.length, f.words, f.lines, f.redirect FROM findings f "
+                "JOIN hosts h ON h.id = f.host_id WHERE h.host = ? ORDER BY f.id",
+                (host,)
+            )
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for path, status, length, words, lines, redirect in rows:
+                item = {'url': f"{base}{path}", 'status': status, 'length': length, 'words': words, 'lines': lines}
+                if redirect:
+                    item['redirectlocation'] = redirect
+                yield item
+
+    def hosts_with_path(self, path, status=None):
+        """Return hosts with a hit at `path` or below it (e.g. "/.git/"), optionally for one status."""
+        # A range on the indexed column instead of LIKE, which SQLite cannot index case-sensitively
+        query = (
+            "SELECT DISTINCT h.host FROM findings f JOIN hosts h ON h.id = f.host_id "
+            "WHERE f.path >= ? AND f.path < ?"
+        )
+        params = [path, path + "\U0010ffff"]
+        if status is not None:
+            query += " AND f.status = ?"
+            params.append(status)
+        with self._lock:
+            return [row[0] for row in self.conn.execute(query + " ORDER BY h.host", params)]
+
+    def hosts_with_status(self, status):
+        """Return hosts that returned `status` for at least one path."""
+        with self._lock:
+            return [row[0] for row in self.conn.execute(
+                "SELECT DISTINCT h.host FROM findings f JOIN hosts h ON h.id = f.host_id "
+                "WHERE f.status = ? ORDER BY h.host",
+                (status,)
+            )]
+
+    def status_counts(self, host=None):
+        """Return {status: hits}, for one host or across all of them."""
+        query = "SELECT f.status, COUNT(*) FROM findings f"
+        params = []
+        if host is not None:
+            query += " JOIN hosts h ON h.id = f.host_id WHERE h.host = ?"
+            params.append(host)
+        with self._lock:
+            return dict(self.conn.execute(query + " GROUP BY f.status", params).fetchall())
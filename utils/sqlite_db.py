@@ -0,0 +1,50 @@
+# utils/sqlite_db.py
+import os
+import sqlite3
+import threading
+
+class SqliteDatabase:
+    """A SQLite file shared by pool workers: WAL mode, one lazily opened connection per process.
+
+    Subclasses set `schema`; connections and locks are dropped when pickled.
+    """
+    schema = ""
+    synchronous = None  # "NORMAL" skips an fsync per commit, which WAL keeps safe
+
+    def __init__(self, path, busy_timeout=30):
+        self.path = path
+        self.busy_timeout = busy_timeout  # Seconds a writer waits on another process's transaction
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(_conn=None, _pid=None, _lock=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self):
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            if self.synchronous:
+                conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            conn.executescript(self.schema)
+            self._migrate(conn)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _migrate(self, conn):
+        """Bring a database created by an older version up to `schema`."""
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None